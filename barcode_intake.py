@@ -17,11 +17,13 @@ Condition Classifications:
 """
 
 import os
+import re
 import json
 import logging
 import hashlib
 from datetime import datetime
-from typing import Dict, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 from enum import Enum
 
 # Configure logging
@@ -31,6 +33,25 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Barcodes are plain ASCII digit strings
+_BARCODE_RE = re.compile(r'[0-9]+')
+
+# Barcode type by digit count (UPC-E may be 6 or 8 digits)
+_BARCODE_TYPES = {
+    6: "UPC-E",
+    8: "UPC-E",
+    12: "UPC-A",
+    13: "EAN-13",
+}
+
+# SKU suffix by condition value (see ItemCondition); shared with
+# price_calculator.build_sku
+CONDITION_SUFFIXES = {
+    "New": "",
+    "Very Good": "-VG",
+    "Acceptable": "-A",
+}
+
 
 class MediaType(Enum):
     """Media type enumeration."""
@@ -51,7 +72,7 @@ class SKUGenerator:
     """Generate SKU codes based on item characteristics."""
     
     @staticmethod
-    def generate(upc: str, condition: ItemCondition, media_type: MediaType) -> str:
+    def generate(upc: str, condition: Union[ItemCondition, str], media_type: MediaType) -> str:
         """
         Generate SKU code.
         
@@ -62,29 +83,26 @@ class SKUGenerator:
         
         Args:
             upc: UPC/EAN barcode
-            condition: Item condition
+            condition: Item condition, or its value string (e.g. "Very Good")
             media_type: Type of media
             
         Returns:
             SKU string
         """
-        if condition == ItemCondition.NEW:
-            return upc
-        elif condition == ItemCondition.VERY_GOOD:
-            return f"{upc}-VG"
-        elif condition == ItemCondition.ACCEPTABLE:
-            return f"{upc}-A"
-        else:
-            return upc
+        condition = getattr(condition, 'value', condition)
+        return upc + CONDITION_SUFFIXES.get(condition, "")
 
 
 class BarcodeIntake:
     """Handle barcode scanning and item intake workflow."""
     
+    __slots__ = ('scan_history', 'duplicates_detected', '_seen_barcodes')
+    
     def __init__(self):
         """Initialize barcode intake handler."""
         self.scan_history = []
         self.duplicates_detected = 0
+        self._seen_barcodes = set()  # O(1) duplicate checks; scan_history keeps order
         
     def scan_barcode(self, barcode: str) -> Dict:
         """
@@ -102,7 +120,7 @@ class BarcodeIntake:
         # UPC-A: 12 digits
         # EAN-13: 13 digits
         # UPC-E: 6 or 8 digits
-        if not barcode.isdigit():
+        if not _BARCODE_RE.fullmatch(barcode):
             logger.error(f"Invalid barcode format: {barcode}")
             return {
                 'valid': False,
@@ -110,11 +128,12 @@ class BarcodeIntake:
                 'barcode': barcode
             }
             
-        if len(barcode) not in [6, 8, 12, 13]:
+        if len(barcode) not in _BARCODE_TYPES:
             logger.warning(f"Unusual barcode length: {len(barcode)} for {barcode}")
         
         # Check for duplicates in current session
-        is_duplicate = barcode in [scan['barcode'] for scan in self.scan_history]
+        is_duplicate = barcode in self._seen_barcodes
+        self._seen_barcodes.add(barcode)
         
         if is_duplicate:
             self.duplicates_detected += 1
@@ -142,14 +161,8 @@ class BarcodeIntake:
             Barcode type (UPC-A, EAN-13, UPC-E, etc.)
         """
         length = len(barcode)
-        if length == 12:
-            return "UPC-A"
-        elif length == 13:
-            return "EAN-13"
-        elif length in [6, 8]:
-            return "UPC-E"
-        else:
-            return f"UNKNOWN_{length}"
+        barcode_type = _BARCODE_TYPES.get(length)
+        return barcode_type if barcode_type is not None else f"UNKNOWN_{length}"
 
 
 class ItemClassifier:
@@ -202,12 +215,13 @@ class ItemClassifier:
             media_type = MediaType.UNKNOWN
         
         # Step 3: Generate SKU
-        sku = SKUGenerator.generate(barcode, condition, media_type)
+        condition_value = condition.value
+        sku = SKUGenerator.generate(barcode, condition_value, media_type)
         
         return {
             'barcode': barcode,
             'sku': sku,
-            'condition': condition.value,
+            'condition': condition_value,
             'media_type': media_type.value,
             'condition_source': source,
             'requires_image_analysis': media_type == MediaType.UNKNOWN,
@@ -240,6 +254,15 @@ class ItemClassifier:
 class IntakeWorkflow:
     """Orchestrate complete barcode intake workflow."""
     
+    __slots__ = (
+        'barcode_intake',
+        'classifier',
+        'airtable_handler',
+        'media_analyzer',
+        'price_calculator',
+        'workflow_log',
+    )
+    
     def __init__(self, airtable_handler=None, media_analyzer=None, price_calculator=None):
         """
         Initialize workflow.
@@ -261,7 +284,8 @@ class IntakeWorkflow:
                     barcode: str,
                     image_url: Optional[str] = None,
                     manual_condition: Optional[str] = None,
-                    median_price: Optional[float] = None) -> Dict:
+                    median_price: Optional[float] = None,
+                    media_type: Optional[str] = None) -> Dict:
         """
         Complete intake workflow for a single item.
         
@@ -278,6 +302,9 @@ class IntakeWorkflow:
             image_url: Optional image URL
             manual_condition: Optional manual condition override
             median_price: Optional median price for pricing calculation
+            media_type: Optional price calculator media type ('video_game',
+                'dvd', 'music_cd'); prices the item with a calculator for
+                that type instead of price_calculator
             
         Returns:
             Complete workflow result
@@ -318,10 +345,15 @@ class IntakeWorkflow:
                 pass
             
             # Step 4: Calculate pricing if median price provided
-            if median_price and self.price_calculator:
+            price_calculator = self.price_calculator
+            if median_price and media_type:
+                # Imported here so intake without pricing doesn't load NumPy/Numba
+                from price_calculator import PriceCalculator
+                price_calculator = PriceCalculator(media_type, classification['condition'])
+            if median_price and price_calculator:
                 logger.info(f"Step 4: Calculating pricing for {barcode}")
-                pricing = self.price_calculator.calculate_best_offer_prices(
-                    self.price_calculator.calculate_list_price(median_price, 0.10)
+                pricing = price_calculator.calculate_best_offer_prices(
+                    price_calculator.calculate_list_price(median_price, 0.10)
                 )
                 result['steps'].append(('pricing_calculation', 'success'))
                 result['pricing'] = pricing
@@ -349,6 +381,87 @@ class IntakeWorkflow:
         
         self.workflow_log.append(result)
         return result
+    
+    def batch_process(self, items: Iterable[Dict], max_workers: Optional[int] = None) -> List[Dict]:
+        """
+        Process a batch of items, optionally across worker processes.
+        
+        Each item runs through process_item on its own in process_one.
+        Per-item work is only microseconds, so the batch runs in this process
+        unless max_workers asks for a pool; a pool only pays off for large
+        batches. Results are then merged in input order: every item whose
+        barcode scanned is replayed through barcode_intake for duplicate
+        detection, and results are logged as process_item would (items with
+        invalid barcodes are returned but not logged).
+        
+        Args:
+            items: Dicts with 'barcode' and optional 'image_url',
+                'condition', 'median_price' and 'media_type' keys
+            max_workers: Worker processes to use (e.g. os.cpu_count());
+                None or 1 runs the batch in this process
+            
+        Returns:
+            One process_item result per item, in input order
+        """
+        items = list(items)
+        columns = (
+            [item['barcode'] for item in items],
+            [item.get('image_url') for item in items],
+            [item.get('condition') for item in items],
+            [item.get('median_price') for item in items],
+            [item.get('media_type') for item in items],
+            [self.price_calculator] * len(items),
+        )
+        
+        workers = max_workers or 1
+        if workers <= 1 or len(items) < 2:
+            results = list(map(process_one, *columns))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                chunksize = max(1, len(items) // (workers * 4))
+                results = list(executor.map(process_one, *columns, chunksize=chunksize))
+        
+        for result in results:
+            if result['status'] == 'failed':
+                continue
+            if ('barcode_scan', 'success') in result['steps']:
+                self.barcode_intake.scan_barcode(result['barcode'])
+            self.workflow_log.append(result)
+        
+        return results
+
+
+def process_one(barcode: str,
+                image_url: Optional[str] = None,
+                condition: Optional[str] = None,
+                median_price: Optional[float] = None,
+                media_type: Optional[str] = None,
+                price_calculator=None) -> Dict:
+    """
+    Run process_item for one item on a fresh workflow.
+    
+    Used by IntakeWorkflow.batch_process; the fresh workflow keeps no state
+    between items, so duplicate detection is left to the caller. It has no
+    Airtable handler or media analyzer.
+    
+    Args:
+        barcode: UPC/EAN code
+        image_url: Optional image URL
+        condition: Optional manual condition (New/Very Good/Acceptable)
+        median_price: Optional median price for pricing calculation
+        media_type: Optional price calculator media type
+        price_calculator: PriceCalculator used when media_type is not given
+        
+    Returns:
+        IntakeWorkflow.process_item result
+    """
+    return IntakeWorkflow(price_calculator=price_calculator).process_item(
+        barcode,
+        image_url=image_url,
+        manual_condition=condition,
+        median_price=median_price,
+        media_type=media_type
+    )
 
 
 def main():
@@ -2,6 +2,7 @@
 Centralized environment variable loading and feature flags.
 """
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -50,8 +51,13 @@ LOG_FILE = os.getenv('LOG_FILE', 'app.log')
 API_RATE_LIMIT_REQUESTS = int(os.getenv('API_RATE_LIMIT_REQUESTS', '100'))
 API_RATE_LIMIT_PERIOD = int(os.getenv('API_RATE_LIMIT_PERIOD', '3600'))  # seconds
 
+@lru_cache(maxsize=1)
 def get_config_status():
-    """Return a dict showing which external APIs are ready."""
+    """Return a dict showing which external APIs are ready.
+
+    Settings are read once at import, so the status is built on the first
+    call and shared afterwards; callers must not mutate it.
+    """
     return {
         'perplexity_ready': bool(PERPLEXITY_API_KEY),
         'telegram_ready': bool(TELEGRAM_BOT_TOKEN),
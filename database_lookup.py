@@ -3,6 +3,7 @@ Provides unified queries to IGDB (games), OMDb (movies), and MusicBrainz (music)
 All functions are stubbed for MVP testing; real API calls replace stubs when keys are provided.
 """
 import requests
+from functools import lru_cache
 from typing import Dict, Optional, List, Any
 from config import OMDB_API_KEY, IGDB_CLIENT_ID, IGDB_CLIENT_SECRET
 from config import MUSICBRAINZ_APP_NAME, MUSICBRAINZ_APP_VERSION, MUSICBRAINZ_CONTACT
@@ -12,6 +13,12 @@ from media_models import UnifiedMediaRecord, MediaType
 
 logger = setup_debug_logger()
 
+# Resolved lookups kept in memory; re-scans of the same disc skip the API call
+LOOKUP_CACHE_SIZE = 4096
+
+# analyzer media_type string -> MediaType (anything else is treated as a game)
+_MEDIA_TYPES = {media_type.value: media_type for media_type in MediaType}
+
 
 def lookup_game(
     title: str,
@@ -63,6 +70,25 @@ def lookup_music(
     return _stub_music_lookup(title, creator_hint, year_hint)
 
 
+@lru_cache(maxsize=LOOKUP_CACHE_SIZE)
+def _cached_lookup(
+    media_type: MediaType,
+    title: str,
+    platform_hint: Optional[str],
+    year_hint: Optional[int]
+) -> Dict[str, Any]:
+    """Memoized dispatch to the per-media lookup functions.
+
+    The returned dict is shared between callers and must not be mutated.
+    Failed lookups raise and are therefore not cached.
+    """
+    if media_type is MediaType.MOVIE:
+        return lookup_movie(title, year_hint)
+    if media_type is MediaType.MUSIC:
+        return lookup_music(title, None, year_hint)
+    return lookup_game(title, platform_hint, year_hint)
+
+
 def resolve_metadata(
     analyzer_result: Dict[str, Any]
 ) -> UnifiedMediaRecord:
@@ -81,19 +107,15 @@ def resolve_metadata(
     title = title_candidates[0] if title_candidates else "Unknown Title"
 
     try:
-        if media_type_str == "game":
-            lookup_result = lookup_game(title, platform_hint, year_hint)
-            media_type = MediaType.GAME
-        elif media_type_str == "movie":
-            lookup_result = lookup_movie(title, year_hint)
-            media_type = MediaType.MOVIE
-        elif media_type_str == "music":
-            lookup_result = lookup_music(title, None, year_hint)
-            media_type = MediaType.MUSIC
-        else:
-            # Default to game if unclear
-            lookup_result = lookup_game(title, platform_hint, year_hint)
-            media_type = MediaType.GAME
+        # Default to game if unclear
+        media_type = _MEDIA_TYPES.get(media_type_str, MediaType.GAME)
+        lookup_result = _cached_lookup(
+            media_type,
+            title,
+            # Movie and music lookups ignore the platform; leave it out of the key
+            platform_hint if media_type is MediaType.GAME else None,
+            year_hint
+        )
 
         # Create unified record
         record = UnifiedMediaRecord(
@@ -106,7 +128,7 @@ def resolve_metadata(
             cover_art=lookup_result.get("cover_art"),
             analyzer_confidence=confidence,
             analyzer_notes=analyzer_notes,
-            external_ids=lookup_result.get("external_ids", {}),
+            external_ids=dict(lookup_result.get("external_ids", {})),
         )
         return record
     except Exception as e:
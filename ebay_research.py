@@ -2,23 +2,59 @@
 # -*- coding: utf-8 -*-
 """eBay Market Research Module - Search by UPC for exact matches"""
 
+import io
 import logging
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 import statistics
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException
+import numpy as np
 
-from bs4 import BeautifulSoup
+# Selenium and lxml are imported lazily inside the methods that need them, so
+# callers that only use calculate_median_price skip their import cost.
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+
+def _has_class(elem, name: str) -> bool:
+    """Check whether an element carries a CSS class token."""
+    return name in (elem.get('class') or '').split()
+
+
+def _release(elem) -> None:
+    """Free a finished iterparse element and its already-processed siblings."""
+    elem.clear()
+    while elem.getprevious() is not None:
+        del elem.getparent()[0]
+
+
+def _parse_sale_price(price_text: Optional[str]) -> float:
+    """Parse a listing's sale price text; NaN when missing or unparseable."""
+    if not price_text:
+        return np.nan
+    price_clean = price_text.replace('$', '').replace(',', '').strip()
+    if ' to ' in price_clean:
+        price_clean = price_clean.split(' to ')[0].strip()
+    try:
+        return float(price_clean)
+    except ValueError:
+        return np.nan
+
+
+def _parse_shipping_cost(shipping_text: Optional[str]) -> float:
+    """Parse a listing's shipping text; free or unparseable shipping is 0.0."""
+    if not shipping_text:
+        return 0.0
+    shipping_text = shipping_text.lower()
+    if 'free' in shipping_text:
+        return 0.0
+    try:
+        return float(shipping_text.replace('$', '').replace(',', '').split()[0])
+    except (ValueError, IndexError):
+        return 0.0
+
+
 class eBayResearcher:
     BASE_URL = "https://www.ebay.com"
     SEARCH_ENDPOINT = "/sch/i.html"
@@ -30,6 +66,9 @@ class eBayResearcher:
         self.research_history = []
         
     def _setup_driver(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        
         chrome_options = Options()
         if self.headless:
             chrome_options.add_argument('--headless')
@@ -53,6 +92,11 @@ class eBayResearcher:
             max_results: Number of listings to analyze
             is_upc: If True, treats query as UPC code
         """
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException
+        
         try:
             search_type = "UPC" if is_upc else "Keyword"
             logger.info(f'Searching eBay by {search_type}: {query}')
@@ -96,55 +140,52 @@ class eBayResearcher:
     
     def _extract_total_prices(self, max_results: int) -> List[float]:
         """Extract TOTAL PRICE (sale price + shipping) from each listing"""
-        prices = []
+        from lxml import etree
+        
         try:
             page_html = self.driver.page_source
-            soup = BeautifulSoup(page_html, 'html.parser')
-            listings = soup.find_all('div', {'class': 's-item'})
             
-            for listing in listings[:max_results]:
-                try:
-                    # Get sale price
-                    price_elem = listing.find('span', {'class': 's-price'})
-                    if not price_elem:
-                        continue
-                    
-                    price_text = price_elem.get_text(strip=True)
-                    price_clean = price_text.replace('$', '').replace(',', '').strip()
-                    
-                    if ' to ' in price_clean:
-                        price_clean = price_clean.split(' to ')[0].strip()
-                    
-                    try:
-                        sale_price = float(price_clean)
-                    except ValueError:
-                        continue
-                    
-                    # Get shipping cost
-                    shipping_elem = listing.find('span', {'class': 's-shipping'})
-                    shipping_cost = 0.0
-                    if shipping_elem:
-                        shipping_text = shipping_elem.get_text(strip=True).lower()
-                        if 'free' in shipping_text:
-                            shipping_cost = 0.0
-                        else:
-                            try:
-                                shipping_clean = shipping_text.replace('$', '').replace(',', '').split()[0]
-                                shipping_cost = float(shipping_clean)
-                            except (ValueError, IndexError):
-                                shipping_cost = 0.0
-                    
-                    # Calculate total price (what buyer paid)
-                    total_price = sale_price + shipping_cost
-                    
-                    # Only include reasonable prices
-                    if 0.99 < total_price < 500:
-                        prices.append(total_price)
-                        logger.debug(f'Found: Sale ${sale_price:.2f} + Shipping ${shipping_cost:.2f} = Total ${total_price:.2f}')
-                        
-                except Exception as e:
-                    logger.debug(f'Error extracting price: {str(e)}')
+            # Stream the page instead of building a full DOM: collect
+            # [sale price text, shipping text] per listing as its spans close,
+            # and free everything outside the listing being read.
+            rows = []
+            listing = None
+            texts = None
+            parser = etree.iterparse(
+                io.BytesIO(page_html.encode('utf-8')),
+                events=('start', 'end'),
+                tag=('div', 'span'),
+                html=True,
+                encoding='utf-8'
+            )
+            for event, elem in parser:
+                if event == 'start':
+                    if listing is None and elem.tag == 'div' and _has_class(elem, 's-item'):
+                        listing = elem
+                        texts = [None, None]
                     continue
+                
+                if listing is None:
+                    _release(elem)
+                elif elem is listing:
+                    rows.append(texts)
+                    listing = None
+                    _release(elem)
+                    if len(rows) >= max_results:
+                        break
+                elif elem.tag == 'span':
+                    if texts[0] is None and _has_class(elem, 's-price'):
+                        texts[0] = ''.join(elem.itertext()).strip()
+                    elif texts[1] is None and _has_class(elem, 's-shipping'):
+                        texts[1] = ''.join(elem.itertext()).strip()
+            
+            # Parse every listing, then filter all totals with one vectorized mask
+            sale_prices = np.fromiter((_parse_sale_price(p) for p, _ in rows), dtype=np.float64, count=len(rows))
+            shipping_costs = np.fromiter((_parse_shipping_cost(sh) for _, sh in rows), dtype=np.float64, count=len(rows))
+            
+            # Total price (what buyer paid); NaN (no sale price) fails both comparisons
+            totals = sale_prices + shipping_costs
+            prices = totals[(totals > 0.99) & (totals < 500)].tolist()
             
             logger.info(f'Extracted {len(prices)} prices from listings')
             return prices
@@ -260,8 +301,8 @@ if __name__ == '__main__':
         print(f'Searching eBay by {search_type}: {query}')
         
         result = research_item_pricing(query, category, headless=False, is_upc=is_upc)
-        import json
-        print(json.dumps(result, indent=2))
+        from json_utils import dumps_pretty
+        print(dumps_pretty(result))
     else:
         print('Usage: python ebay_research.py "search query" [category] [--upc]')
         print('Categories: video_game, dvd, music_cd')
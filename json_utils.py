@@ -1,7 +1,33 @@
 """Robust JSON extraction utilities for handling various API response formats"""
 import re
 import json
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
+
+# orjson is a much faster drop-in for decoding/encoding; its JSONDecodeError
+# subclasses json.JSONDecodeError, so callers can keep catching the stdlib type.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+loads = orjson.loads if orjson is not None else json.loads
+
+
+def dumps_pretty(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """
+    Serialize to JSON text indented by two spaces.
+    
+    Args:
+        obj: The object to serialize
+        default: Fallback serializer for unsupported types (like json.dumps)
+    
+    Returns:
+        JSON string
+    """
+    if orjson is not None:
+        # Non-str keys are stringified as json.dumps does
+        return orjson.dumps(obj, default=default, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, indent=2, default=default)
 
 
 def extract_json_from_response(content: Any) -> Optional[Dict[str, Any]]:
@@ -35,7 +61,7 @@ def extract_json_from_response(content: Any) -> Optional[Dict[str, Any]]:
 
     # Try to parse as JSON directly
     try:
-        return json.loads(content)
+        return loads(content)
     except json.JSONDecodeError:
         pass
 
@@ -50,7 +76,7 @@ def extract_json_from_response(content: Any) -> Optional[Dict[str, Any]]:
         match = re.search(pattern, content, re.DOTALL)
         if match:
             try:
-                return json.loads(match.group(1).strip())
+                return loads(match.group(1).strip())
             except json.JSONDecodeError:
                 continue
 
@@ -69,7 +95,7 @@ def extract_json_from_response(content: Any) -> Optional[Dict[str, Any]]:
                     if level == 0:
                         try:
                             json_str = content[start_idx:i+1]
-                            return json.loads(json_str)
+                            return loads(json_str)
                         except json.JSONDecodeError:
                             break
 
@@ -7,9 +7,19 @@ import json
 from typing import Dict, Optional, List, Any
 from config import PERPLEXITY_API_KEY, USE_STUB_ANALYZER
 from debug_logging import setup_debug_logger
+from json_utils import loads
 
 logger = setup_debug_logger()
 
+PERPLEXITY_API_URL = 'https://api.perplexity.ai/chat/completions'
+
+# Shared session so repeated analyses reuse the pooled TCP/TLS connection
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    'Authorization': f'Bearer {PERPLEXITY_API_KEY}',
+    'Content-Type': 'application/json'
+})
+
 
 def analyze_disc_image(image_bytes: bytes) -> Dict[str, Any]:
     """Analyze a disc image using Perplexity AI.
@@ -46,12 +56,8 @@ def _perplexity_analyze(image_url: str) -> Dict[str, Any]:
 Be concise and extract exact text visible on the disc."""
 
     try:
-        response = requests.post(
-            'https://api.perplexity.ai/chat/completions',
-            headers={
-                'Authorization': f'Bearer {PERPLEXITY_API_KEY}',
-                'Content-Type': 'application/json'
-            },
+        response = _SESSION.post(
+            PERPLEXITY_API_URL,
             json={
                 'model': 'sonar-pro',
                 'messages': [{
@@ -74,12 +80,12 @@ Be concise and extract exact text visible on the disc."""
             logger.error(f"Perplexity API error: {response.status_code}")
             return _stub_analyze(None)
 
-        result = response.json()
+        result = loads(response.content)
         content = result['choices'][0]['message']['content']
         
         # Extract JSON from response
         try:
-            data = json.loads(content)
+            data = loads(content)
             logger.debug(f"Successfully analyzed image: {data}")
             return data
         except json.JSONDecodeError:
@@ -25,6 +25,21 @@ class MediaStatus(str, Enum):
 class UnifiedMediaRecord:
     """Unified data model for all media types: games, movies, music."""
 
+    __slots__ = (
+        "title",
+        "media_type",
+        "platform",
+        "creator",
+        "year",
+        "upc",
+        "cover_art",
+        "status",
+        "notes",
+        "analyzer_confidence",
+        "analyzer_notes",
+        "external_ids",
+    )
+
     def __init__(
         self,
         title: str,
@@ -3,16 +3,29 @@
 """Price Calculator Module for eBay Media Reselling"""
 
 import logging
-from decimal import Decimal, ROUND_HALF_UP
-from typing import Dict, Optional
+import math
+from functools import lru_cache
+from typing import Dict, Optional, Tuple, Union
 import argparse
 from datetime import datetime
 
+import numpy as np
+
+from barcode_intake import CONDITION_SUFFIXES
+
 try:
     from ebay_research import research_item_pricing
 except ImportError:
     research_item_pricing = None
 
+# Numba (pinned in requirements.txt) compiles the pricing kernels; if it is
+# missing they still run, as plain Python
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        return lambda func: func
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -28,25 +41,170 @@ MIN_PROFIT_MARGIN = 2.75
 MIN_LIST_PRICE = 5.00
 MARGIN_THRESHOLD = 0.80
 
+MARKUP_SCENARIOS = np.array([0.05, 0.10, 0.15, 0.20])
+# Per-scenario list-price multipliers and report labels, derived once
+_MARKUP_FACTORS = 1 + MARKUP_SCENARIOS
+_MARKUP_PERCENTS = tuple(int(markup * 100) for markup in MARKUP_SCENARIOS.tolist())
+AUTO_ACCEPT_RATIO = 0.80
+MINIMUM_OFFER_RATIO = 0.70
+
+
+def _round_half_up(x: float) -> float:
+    """Round a price to cents, half-up, without building a Decimal."""
+    # Work on whole cents of |x| and compare against the half-cent boundary
+    # itself rather than adding 0.5 to x * 100, which misrounds inputs such as
+    # 1.005 (100.49999999999999). Halves round away from zero, so this matches
+    # Decimal(str(x)).quantize(Decimal('0.01'), ROUND_HALF_UP) for any sign.
+    magnitude = abs(x)
+    cents = math.floor(magnitude * 100)
+    if magnitude >= (cents + 0.5) / 100:
+        cents += 1
+    return math.copysign(cents / 100, x)
+
+
+_round_half_up_jit = njit(cache=True)(_round_half_up)
+
+
+@njit(cache=True)
+def _offers_kernel(list_price: float, cog: float, shipping: float) -> Tuple[float, float, float, float]:
+    """Best-offer prices and profits for one list price.
+
+    Returns:
+        Tuple of (auto_accept, minimum, profit_auto_accept, profit_minimum).
+    """
+    auto_accept = _round_half_up_jit(list_price * AUTO_ACCEPT_RATIO)
+    minimum = _round_half_up_jit(list_price * MINIMUM_OFFER_RATIO)
+    return auto_accept, minimum, auto_accept - cog - shipping, minimum - cog - shipping
+
+
+@njit(cache=True)
+def _price_kernel(median: float, cog: float, shipping: float, factors: np.ndarray) -> np.ndarray:
+    """Price every markup scenario for one item.
+
+    Args:
+        factors: List-price multipliers, i.e. 1 + markup per scenario.
+
+    Returns:
+        Array of shape (len(factors), 5) holding (list_price, auto_accept,
+        minimum, profit_auto_accept, profit_minimum) per scenario.
+    """
+    out = np.empty((factors.shape[0], 5))
+    for i in range(factors.shape[0]):
+        list_price = max(median * factors[i], MIN_LIST_PRICE)
+        auto_accept, minimum, profit_auto, profit_min = _offers_kernel(list_price, cog, shipping)
+        out[i, 0] = list_price
+        out[i, 1] = auto_accept
+        out[i, 2] = minimum
+        out[i, 3] = profit_auto
+        out[i, 4] = profit_min
+    return out
+
+
+def _offer_summary(auto_accept: float, minimum: float, profit_auto: float, profit_min: float) -> Dict[str, float]:
+    """Build the best-offer dict, warning when an offer misses the profit floor."""
+    if profit_auto < MIN_PROFIT_MARGIN:
+        logger.warning(f'Auto-accept price ${auto_accept:.2f} yields only ${profit_auto:.2f} profit (minimum ${MIN_PROFIT_MARGIN:.2f} required)')
+    if profit_min < MIN_PROFIT_MARGIN:
+        logger.warning(f'Minimum ask ${minimum:.2f} yields only ${profit_min:.2f} profit (minimum ${MIN_PROFIT_MARGIN:.2f} required)')
+    
+    return {
+        'auto_accept': auto_accept,
+        'minimum': minimum,
+        'profit_auto_accept': profit_auto,
+        'profit_minimum': profit_min,
+        'meets_margin_threshold': profit_auto >= MIN_PROFIT_MARGIN
+    }
+
+
+def _round_cents_half_up(values: np.ndarray) -> np.ndarray:
+    """Vectorized counterpart of _round_half_up."""
+    magnitude = np.abs(values)
+    cents = np.floor(magnitude * 100)
+    cents = np.where(magnitude >= (cents + 0.5) / 100, cents + 1, cents)
+    return np.copysign(cents / 100, values)
+
+
+def pricing_tensor(medians: np.ndarray, markups: np.ndarray = MARKUP_SCENARIOS) -> np.ndarray:
+    """Compute list and best-offer prices for every median/markup pair at once.
+
+    Args:
+        medians: 1-D array of median sold prices, one per item.
+        markups: 1-D array of markup fractions (default: the four matrix scenarios).
+
+    Returns:
+        Array of shape (len(medians), len(markups), 3) holding
+        (list_price, auto_accept, minimum) for each item and scenario.
+    """
+    medians = np.asarray(medians, dtype=np.float64)
+    list_prices = np.maximum(medians[:, None] * (1 + markups), MIN_LIST_PRICE)
+    auto_accept = _round_cents_half_up(list_prices * AUTO_ACCEPT_RATIO)
+    minimum = _round_cents_half_up(list_prices * MINIMUM_OFFER_RATIO)
+    return np.stack((list_prices, auto_accept, minimum), axis=-1)
+
+
+def calculate_offers_batch(medians: np.ndarray,
+                           shipping: Union[float, np.ndarray],
+                           cog: Union[float, np.ndarray] = DEFAULT_COG,
+                           markup: float = 0.10) -> np.ndarray:
+    """Price a whole batch of items at one markup in a few array operations.
+
+    Args:
+        medians: 1-D array of median sold prices, one per item.
+        shipping: Shipping cost, either a scalar or one value per item.
+        cog: Cost of goods, either a scalar or one value per item.
+        markup: Markup fraction applied to every median (default 10%).
+
+    Returns:
+        Array of shape (len(medians), 4) holding (auto_accept, minimum,
+        profit_auto_accept, profit_minimum) for each item, matching
+        calculate_best_offer_prices(calculate_list_price(median, markup)).
+    """
+    # (N, 2) auto-accept and minimum prices from the single-markup tensor
+    prices = pricing_tensor(medians, np.array([markup]))[:, 0, 1:]
+    # Per-item costs as column vectors so they broadcast across both prices
+    cog = np.reshape(np.asarray(cog, dtype=np.float64), (-1, 1))
+    shipping = np.reshape(np.asarray(shipping, dtype=np.float64), (-1, 1))
+    return np.hstack((prices, prices - cog - shipping))
+
+
+@lru_cache(maxsize=16)
+def _weight_for(media_type: str, condition: str) -> int:
+    """Shipping weight in ounces for a media type/condition pair."""
+    if condition in ['New', 'Very Good']:
+        return WEIGHT_VIDEO_GAME if media_type == 'video_game' else (WEIGHT_DVD if media_type == 'dvd' else WEIGHT_CD)
+    return WEIGHT_DISC_ONLY
+
+
+@lru_cache(maxsize=16)
+def _shipping_for(media_type: str) -> float:
+    """Shipping cost charged for a media type."""
+    return SHIPPING_COST.get(media_type, 3.50)
+
+
 class PriceCalculator:
     """Calculate optimal pricing for eBay media listings."""
     
+    __slots__ = ('media_type', 'condition', 'cog', 'median_price', 'research_log')
+    
     def __init__(self, media_type: str, condition: str = 'Acceptable', cog: float = DEFAULT_COG):
+        self.research_log = []
+        self.configure(media_type, condition, cog)
+        
+    def configure(self, media_type: str, condition: str = 'Acceptable', cog: float = DEFAULT_COG) -> 'PriceCalculator':
+        """Point this calculator at another item so batches can reuse one instance."""
         self.media_type = media_type
         self.condition = condition
         self.cog = cog
         self.median_price = None
-        self.research_log = []
+        return self
         
     def get_weight(self) -> int:
         """Get weight based on media type and condition."""
-        if self.condition in ['New', 'Very Good']:
-            return WEIGHT_VIDEO_GAME if self.media_type == 'video_game' else (WEIGHT_DVD if self.media_type == 'dvd' else WEIGHT_CD)
-        return WEIGHT_DISC_ONLY
+        return _weight_for(self.media_type, self.condition)
         
     def get_shipping_cost(self) -> float:
         """Get shipping cost for this item."""
-        return SHIPPING_COST.get(self.media_type, 3.50)
+        return _shipping_for(self.media_type)
         
     def research_median_price(self, search_query: str) -> Optional[float]:
         """Research eBay for comparable items to find median price."""
@@ -75,42 +233,27 @@ class PriceCalculator:
         
     def calculate_best_offer_prices(self, list_price: float) -> Dict[str, float]:
         """Calculate best offer pricing strategy."""
-        auto_accept = Decimal(str(list_price * 0.80)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-        minimum = Decimal(str(list_price * 0.70)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-        
-        profit_auto = float(auto_accept) - self.cog - self.get_shipping_cost()
-        profit_min = float(minimum) - self.cog - self.get_shipping_cost()
-        
-        if profit_auto < MIN_PROFIT_MARGIN:
-            logger.warning(f'Auto-accept price ${float(auto_accept):.2f} yields only ${profit_auto:.2f} profit (minimum ${MIN_PROFIT_MARGIN:.2f} required)')
-        if profit_min < MIN_PROFIT_MARGIN:
-            logger.warning(f'Minimum ask ${float(minimum):.2f} yields only ${profit_min:.2f} profit (minimum ${MIN_PROFIT_MARGIN:.2f} required)')
-        
-        return {
-            'auto_accept': float(auto_accept),
-            'minimum': float(minimum),
-            'profit_auto_accept': profit_auto,
-            'profit_minimum': profit_min,
-            'meets_margin_threshold': profit_auto >= MIN_PROFIT_MARGIN
-        }
+        return _offer_summary(*_offers_kernel(float(list_price), float(self.cog), self.get_shipping_cost()))
     
     def generate_pricing_matrix(self, median_price: float) -> Dict:
         """Generate complete pricing matrix for different scenarios."""
+        cog = self.cog
+        shipping = self.get_shipping_cost()
         matrix = {
             'media_type': self.media_type,
             'condition': self.condition,
-            'cog': self.cog,
+            'cog': cog,
             'weight_oz': self.get_weight(),
-            'shipping_cost': self.get_shipping_cost(),
+            'shipping_cost': shipping,
             'median_price': median_price,
             'scenarios': []
         }
         
-        for markup in [0.05, 0.10, 0.15, 0.20]:
-            list_price = self.calculate_list_price(median_price, markup)
-            offers = self.calculate_best_offer_prices(list_price)
+        rows = _price_kernel(float(median_price), float(cog), shipping, _MARKUP_FACTORS).tolist()
+        for markup_percent, (list_price, auto_accept, minimum, profit_auto, profit_min) in zip(_MARKUP_PERCENTS, rows):
+            offers = _offer_summary(auto_accept, minimum, profit_auto, profit_min)
             scenario = {
-                'markup_percent': int(markup * 100),
+                'markup_percent': markup_percent,
                 'list_price': round(list_price, 2),
                 'best_offers': offers,
                 'margin_check': {'80_percent_achieves_min': offers['meets_margin_threshold']}
@@ -120,13 +263,8 @@ class PriceCalculator:
         return matrix
 
 def build_sku(upc: str, condition: str) -> str:
-    """Build SKU based on UPC and condition."""
-    if condition == 'New':
-        return upc
-    elif condition == 'Very Good':
-        return f'{upc}-VG'
-    else:
-        return f'{upc}-A'
+    """Build SKU based on UPC and condition (unknown conditions count as Acceptable)."""
+    return upc + CONDITION_SUFFIXES.get(condition, CONDITION_SUFFIXES['Acceptable'])
 
 def main():
     """Demonstrate price calculation with eBay research."""
@@ -9,14 +9,20 @@ Supports per-endpoint and per-user rate limits with automatic cleanup.
 import time
 import threading
 from functools import wraps
-from collections import defaultdict
-from typing import Dict, List, Tuple, Optional
-from flask import request, jsonify
+from collections import deque
+from typing import Callable, Deque, Dict, List, Tuple, Optional
+from flask import Response, request
+
+# 429 body serialized once; only retry_after varies per rejected request
+_429_BODY = b'{"error":"Rate limit exceeded","retry_after":%d}'
 
 
 class RateLimiter:
     """Sliding-window rate limiter with per-endpoint and per-user scoping."""
 
+    LOCK_STRIPES = 16  # must be a power of two
+    CLEANUP_BATCH = 64  # idle-key checks per request while a sweep is running
+
     def __init__(self, cleanup_interval: int = 3600):
         """Initialize rate limiter.
 
@@ -25,10 +31,20 @@ class RateLimiter:
         """
         self.limits: Dict[str, int] = {}  # endpoint -> max_requests
         self.windows: Dict[str, int] = {}  # endpoint -> window_size (seconds)
-        self.requests: Dict[str, Dict[str, List[float]]] = defaultdict(lambda: defaultdict(list))
+        # Buckets are sharded by endpoint so checks on unrelated endpoints
+        # don't contend on a single lock. Each shard is one flat
+        # (endpoint, limit_key) -> timestamps dict guarded by its own lock.
+        self.requests: List[Dict[Tuple[str, str], Deque[float]]] = [{} for _ in range(self.LOCK_STRIPES)]
         self.cleanup_interval = cleanup_interval
-        self.last_cleanup = time.time()
-        self.lock = threading.Lock()
+        self.last_cleanup: List[float] = [time.monotonic()] * self.LOCK_STRIPES  # per shard
+        # Bucket keys still to check in each shard's current sweep
+        self._sweep_pending: List[List[Tuple[str, str]]] = [[] for _ in range(self.LOCK_STRIPES)]
+        self._locks = [threading.Lock() for _ in range(self.LOCK_STRIPES)]
+        self._config_lock = threading.Lock()
+
+    def _shard(self, endpoint: str) -> int:
+        """Return the index of the shard holding an endpoint's buckets."""
+        return hash(endpoint) & (self.LOCK_STRIPES - 1)
 
     def set_limit(self, endpoint: str, requests_per_minute: int, window: int = 60):
         """Configure rate limit for endpoint.
@@ -38,24 +54,39 @@ class RateLimiter:
             requests_per_minute: Max requests allowed in window
             window: Time window in seconds (default 60)
         """
-        self.limits[endpoint] = requests_per_minute
-        self.windows[endpoint] = window
-
-    def _cleanup_old_timestamps(self):
-        """Remove timestamps older than current window (prevent memory leak)."""
-        now = time.time()
-        if now - self.last_cleanup < self.cleanup_interval:
-            return
-
-        for endpoint in self.requests:
-            for key in self.requests[endpoint]:
-                window = self.windows.get(endpoint, 60)
-                self.requests[endpoint][key] = [
-                    ts for ts in self.requests[endpoint][key]
-                    if now - ts < window
-                ]
-
-        self.last_cleanup = now
+        # is_allowed reads limits without a lock, so publish the window first:
+        # once an endpoint is visible in limits its window already exists
+        with self._config_lock:
+            self.windows[endpoint] = window
+            self.limits[endpoint] = requests_per_minute
+
+    def _cleanup_old_timestamps(self, shard: int, now: float):
+        """Sweep a batch of one shard's buckets, dropping idle keys (prevent memory leak).
+
+        Active buckets trim themselves in is_allowed; this only reclaims keys
+        that stopped sending requests. Once per cleanup_interval a shard
+        snapshots its bucket keys, then each request checks at most
+        CLEANUP_BATCH of them, so no request pays for the whole shard.
+        Runs under the shard lock the caller already holds.
+        """
+        pending = self._sweep_pending[shard]
+        if not pending:
+            if now - self.last_cleanup[shard] < self.cleanup_interval:
+                return
+            self.last_cleanup[shard] = now
+            pending.extend(self.requests[shard])
+
+        buckets = self.requests[shard]
+        for _ in range(min(self.CLEANUP_BATCH, len(pending))):
+            bucket_key = pending.pop()
+            timestamps = buckets.get(bucket_key)
+            if timestamps is None:
+                continue
+            cutoff = now - self.windows.get(bucket_key[0], 60)
+            while timestamps and timestamps[0] <= cutoff:
+                timestamps.popleft()
+            if not timestamps:
+                del buckets[bucket_key]
 
     def is_allowed(self, endpoint: str, limit_key: str = 'global') -> Tuple[bool, Optional[int]]:
         """Check if request is allowed under rate limit.
@@ -67,28 +98,53 @@ class RateLimiter:
         Returns:
             Tuple of (is_allowed: bool, retry_after: Optional[int] seconds)
         """
-        with self.lock:
-            self._cleanup_old_timestamps()
+        # Unconfigured endpoints are never limited; dict membership is atomic
+        # under the GIL and limits are only added, so skip the lock entirely
+        if endpoint not in self.limits:
+            return True, None
 
-            if endpoint not in self.limits:
-                return True, None
+        shard = self._shard(endpoint)
+        with self._locks[shard]:
+            return self._check(shard, endpoint, limit_key)
 
-            window = self.windows[endpoint]
-            max_requests = self.limits[endpoint]
-            now = time.time()
-            cutoff = now - window
+    async def is_allowed_async(self, endpoint: str, limit_key: str = 'global') -> Tuple[bool, Optional[int]]:
+        """Awaitable is_allowed for ASGI handlers (Quart, FastAPI, ...).
 
-            timestamps = self.requests[endpoint][limit_key]
-            recent = [ts for ts in timestamps if ts > cutoff]
-            self.requests[endpoint][limit_key] = recent
+        The check never awaits: it takes the shard lock only for a few
+        dict/deque operations, so it runs inline on the event loop without
+        an asyncio lock. Sharing the shard lock lets async and threaded
+        callers use one limiter.
 
-            if len(recent) < max_requests:
-                self.requests[endpoint][limit_key].append(now)
-                return True, None
-            else:
-                oldest = recent[0]
-                retry_after = int(window - (now - oldest)) + 1
-                return False, retry_after
+        Returns:
+            Tuple of (is_allowed: bool, retry_after: Optional[int] seconds)
+        """
+        return self.is_allowed(endpoint, limit_key)
+
+    def _check(self, shard: int, endpoint: str, limit_key: str) -> Tuple[bool, Optional[int]]:
+        """Record a request against its bucket; caller holds the shard lock."""
+        window = self.windows[endpoint]
+        max_requests = self.limits[endpoint]
+        now = time.monotonic()
+        cutoff = now - window
+
+        self._cleanup_old_timestamps(shard, now)
+
+        # Timestamps are appended in order, so expired ones sit at the left
+        buckets = self.requests[shard]
+        bucket_key = (endpoint, limit_key)
+        timestamps = buckets.get(bucket_key)
+        if timestamps is None:
+            timestamps = buckets[bucket_key] = deque()
+        while timestamps and timestamps[0] <= cutoff:
+            timestamps.popleft()
+
+        if len(timestamps) < max_requests:
+            timestamps.append(now)
+            return True, None
+        else:
+            oldest = timestamps[0]
+            retry_after = int(window - (now - oldest)) + 1
+            return False, retry_after
 
     def limit(self, endpoint: str, requests_per_minute: int = 100, use_user_id: bool = False):
         """Decorator for rate limiting endpoints.
@@ -117,11 +173,11 @@ class RateLimiter:
                 allowed, retry_after = self.is_allowed(endpoint, limit_key)
 
                 if not allowed:
-                    response = jsonify({
-                        'error': 'Rate limit exceeded',
-                        'retry_after': retry_after
-                    })
-                    response.status_code = 429
+                    response = Response(
+                        _429_BODY % retry_after,
+                        status=429,
+                        mimetype='application/json'
+                    )
                     response.headers['Retry-After'] = str(retry_after)
                     return response
 
@@ -131,16 +187,57 @@ class RateLimiter:
 
         return decorator
 
+    def async_limit(self, endpoint: str, requests_per_minute: int = 100,
+                    key_func: Optional[Callable[..., str]] = None):
+        """Decorator for rate limiting async (ASGI) endpoints.
+
+        Args:
+            endpoint: Endpoint identifier
+            requests_per_minute: Max requests per minute
+            key_func: Called with the handler's arguments to get a per-user
+                limit key; if None, a global endpoint limit is applied
+
+        Rejected requests get a Quart/Flask-style (body, status, headers)
+        tuple with the same 429 payload as limit().
+
+        Example:
+            @app.route('/price-lookup')
+            @limiter.async_limit('price-lookup', requests_per_minute=20)
+            async def price_lookup():
+                return 'OK'
+        """
+        self.set_limit(endpoint, requests_per_minute)
+
+        def decorator(f):
+            @wraps(f)
+            async def decorated_function(*args, **kwargs):
+                limit_key = key_func(*args, **kwargs) if key_func else 'global'
+
+                allowed, retry_after = await self.is_allowed_async(endpoint, limit_key)
+
+                if not allowed:
+                    return _429_BODY % retry_after, 429, {
+                        'Content-Type': 'application/json',
+                        'Retry-After': str(retry_after)
+                    }
+
+                return await f(*args, **kwargs)
+
+            return decorated_function
+
+        return decorator
+
     def get_stats(self, endpoint: str) -> Dict:
         """Get current rate limit stats for endpoint.
 
         Returns:
             Dict with limit, window, and current request counts
         """
-        with self.lock:
+        shard = self._shard(endpoint)
+        with self._locks[shard]:
             window = self.windows.get(endpoint, 60)
             max_requests = self.limits.get(endpoint, 'unlimited')
-            now = time.time()
+            now = time.monotonic()
             cutoff = now - window
 
             stats = {
@@ -150,10 +247,12 @@ class RateLimiter:
                 'current_requests': {}
             }
 
-            if endpoint in self.requests:
-                for key, timestamps in self.requests[endpoint].items():
-                    recent = [ts for ts in timestamps if ts > cutoff]
-                    stats['current_requests'][key] = len(recent)
+            for (bucket_endpoint, key), timestamps in self.requests[shard].items():
+                if bucket_endpoint != endpoint:
+                    continue
+                while timestamps and timestamps[0] <= cutoff:
+                    timestamps.popleft()
+                stats['current_requests'][key] = len(timestamps)
 
             return stats
 
@@ -6,9 +6,12 @@ Calculates shipping costs with weight-based adjustments.
 Supports static rates with dynamic overrides for heavier items.
 """
 
+from bisect import bisect_right
 from typing import Dict, Optional, Tuple
 from enum import Enum
 
+import numpy as np
+
 
 class ShippingMethod(Enum):
     """Supported shipping methods."""
@@ -35,17 +38,46 @@ class ShippingCalculator:
         (float('inf'), 3.00),  # 8+ lbs: +$3.00
     ]
 
+    # Sorted finite thresholds and their surcharges: bisect_right on the
+    # thresholds indexes straight into the surcharge amounts (a weight equal
+    # to a threshold falls in the next bracket, as in WEIGHT_SURCHARGES).
+    _THRESHOLDS = [threshold for threshold, _ in WEIGHT_SURCHARGES[:-1]]
+    _SURCHARGES = [surcharge for _, surcharge in WEIGHT_SURCHARGES]
+
+    # Array forms of the same brackets for vectorized searchsorted lookups
+    _SURCHARGE_THRESHOLDS = np.array(_THRESHOLDS)
+    _SURCHARGE_AMOUNTS = np.array(_SURCHARGES)
+
+    # Default weights by media type (oz)
+    DEFAULT_WEIGHTS = {
+        'dvd': 4.5,
+        'bluray': 4.0,
+        'cd': 3.0,
+        'vinyl': 6.0,
+        'steelbook': 8.0,
+        'boxset': 12.0,
+    }
+
+    ESTIMATE_CACHE_SIZE = 512
+
+    __slots__ = ('rates', '_estimate_cache')
+
     def __init__(self, custom_rates: Optional[Dict[str, float]] = None):
         """Initialize calculator.
 
         Args:
             custom_rates: Override base rates (e.g., {'media_mail': 4.50})
         """
-        self.rates = self.BASE_RATES.copy()
+        # Keyed by the method string so hot paths skip the Enum round-trip
+        self.rates: Dict[str, float] = {
+            method.value: rate for method, rate in self.BASE_RATES.items()
+        }
         if custom_rates:
             for method, rate in custom_rates.items():
-                method_enum = ShippingMethod(method) if isinstance(method, str) else method
-                self.rates[method_enum] = rate
+                self.rates[ShippingMethod(method).value] = rate
+        # (media_type, weight_oz, rates snapshot) -> estimate; the snapshot keeps
+        # edits to the public rates dict from serving stale estimates
+        self._estimate_cache: Dict[Tuple, Dict] = {}
 
     def calculate_surcharge(self, weight_oz: float) -> float:
         """Calculate weight-based surcharge.
@@ -58,29 +90,24 @@ class ShippingCalculator:
         """
         if weight_oz <= 0:
             return 0.0
-
-        for threshold, surcharge in self.WEIGHT_SURCHARGES:
-            if weight_oz < threshold:
-                return surcharge
-
-        return self.WEIGHT_SURCHARGES[-1][1]
+        return self._SURCHARGES[bisect_right(self._THRESHOLDS, weight_oz)]
 
     def calculate_cost(self, method: str, weight_oz: float = 6.0) -> Tuple[float, Dict]:
         """Calculate total shipping cost.
 
         Args:
-            method: Shipping method ('media_mail' or 'ground_advantage')
+            method: Shipping method ('media_mail' or 'ground_advantage'), or a
+                ShippingMethod member
             weight_oz: Item weight in ounces (default 6oz for typical CD)
 
         Returns:
             Tuple of (total_cost, details_dict)
         """
         try:
-            method_enum = ShippingMethod(method)
-        except ValueError:
+            base_rate = self.rates[getattr(method, 'value', method)]
+        except KeyError:
             raise ValueError(f"Unknown method: {method}")
 
-        base_rate = self.rates[method_enum]
         surcharge = self.calculate_surcharge(weight_oz)
         total = round(base_rate + surcharge, 2)
 
@@ -95,6 +122,9 @@ class ShippingCalculator:
     def estimate_for_media_type(self, media_type: str, weight_oz: float = None) -> Dict:
         """Estimate shipping for common media types.
 
+        Estimates are memoized per (media_type, weight_oz) and current rates;
+        each call still returns fresh dicts, so callers may modify the result.
+
         Args:
             media_type: 'dvd', 'bluray', 'cd', 'vinyl', 'steelbook', 'boxset'
             weight_oz: Override weight estimate
@@ -102,17 +132,22 @@ class ShippingCalculator:
         Returns:
             Dict with estimates for both methods
         """
-        # Default weights by media type
-        default_weights = {
-            'dvd': 4.5,
-            'bluray': 4.0,
-            'cd': 3.0,
-            'vinyl': 6.0,
-            'steelbook': 8.0,
-            'boxset': 12.0,
+        key = (media_type, weight_oz, tuple(self.rates.items()))
+        estimate = self._estimate_cache.get(key)
+        if estimate is None:
+            if len(self._estimate_cache) >= self.ESTIMATE_CACHE_SIZE:
+                self._estimate_cache.clear()
+            estimate = self._estimate_cache[key] = self._estimate(media_type, weight_oz)
+
+        return {
+            **estimate,
+            'media_mail': dict(estimate['media_mail']),
+            'ground_advantage': dict(estimate['ground_advantage'])
         }
 
-        actual_weight = weight_oz or default_weights.get(media_type.lower(), 5.0)
+    def _estimate(self, media_type: str, weight_oz: Optional[float]) -> Dict:
+        """Compute an uncached estimate_for_media_type result."""
+        actual_weight = weight_oz or self.DEFAULT_WEIGHTS.get(media_type.lower(), 5.0)
 
         media_mail_cost, media_mail_details = self.calculate_cost(
             ShippingMethod.MEDIA_MAIL.value,
@@ -131,27 +166,55 @@ class ShippingCalculator:
             'recommended': 'media_mail' if media_mail_cost < ground_cost else 'ground_advantage'
         }
 
-    def bulk_estimate(self, items: list) -> Dict:
+    def bulk_estimate(self, items: list, include_details: bool = True) -> Dict:
         """Estimate shipping for multiple items.
 
+        Base rates and surcharges for the whole batch are looked up with NumPy
+        in one pass.
+
         Args:
-            items: List of {'method': str, 'weight_oz': float} dicts
+            items: List of {'method': str or ShippingMethod, 'weight_oz': float} dicts
+            include_details: If False, skip building the per-item detail dicts
 
         Returns:
             Dict with individual and total estimates
         """
-        estimates = []
-        total_cost = 0.0
+        methods = [item.get('method', 'media_mail') for item in items]
+        weights = [item.get('weight_oz', 5.0) for item in items]
+
+        base_by_method = {}
+        for method in set(methods):
+            try:
+                base_by_method[method] = self.rates[getattr(method, 'value', method)]
+            except KeyError:
+                raise ValueError(f"Unknown method: {method}")
+
+        weight_arr = np.array(weights, dtype=np.float64)
+        base_arr = np.array([base_by_method[m] for m in methods], dtype=np.float64)
+        surcharge_arr = np.where(
+            weight_arr <= 0,
+            0.0,
+            self._SURCHARGE_AMOUNTS[np.searchsorted(self._SURCHARGE_THRESHOLDS, weight_arr, side='right')]
+        )
+        # Round each total with round() as calculate_cost does: np.round
+        # rounds scaled values and disagrees on sub-cent rates (1.055 -> 1.06)
+        totals = [round(total, 2) for total in (base_arr + surcharge_arr).tolist()]
 
-        for item in items:
-            method = item.get('method', 'media_mail')
-            weight = item.get('weight_oz', 5.0)
-            cost, details = self.calculate_cost(method, weight)
-            estimates.append(details)
-            total_cost += cost
+        estimates = []
+        if include_details:
+            for method, base_rate, weight, surcharge, total in zip(
+                methods, base_arr.tolist(), weights, surcharge_arr.tolist(), totals
+            ):
+                estimates.append({
+                    'method': method,
+                    'base_rate': base_rate,
+                    'weight_oz': weight,
+                    'surcharge': surcharge,
+                    'total': total
+                })
 
         return {
             'items': estimates,
-            'total_cost': round(total_cost, 2),
+            'total_cost': round(sum(totals), 2),
             'count': len(items)
         }
@@ -89,45 +89,37 @@ class TestBarcodeIntake:
         assert intake.scan_history[2]['barcode'] == '045496508234'
 
 
+@pytest.fixture(scope="module")
+def classifier():
+    """Shared ItemClassifier; classification keeps no per-item state."""
+    return ItemClassifier()
+
+
 class TestItemClassifier:
     """Test suite for ItemClassifier class."""
     
-    def test_classify_with_manual_condition_new(self):
-        """Test classification with manual New condition."""
-        classifier = ItemClassifier()
-        result = classifier.classify_item('045496508234', manual_condition='New')
-        
-        assert result['condition'] == 'New'
+    @pytest.mark.parametrize("barcode,condition,expected_sku", [
+        ('045496508234', 'New', '045496508234'),
+        ('012569863147', 'Very Good', '012569863147-VG'),
+        ('724384960145', 'Acceptable', '724384960145-A'),
+    ])
+    def test_classify_with_manual_condition(self, classifier, barcode, condition, expected_sku):
+        """Test classification with each manual condition."""
+        result = classifier.classify_item(barcode, manual_condition=condition)
+        
+        assert result['condition'] == condition
         assert result['condition_source'] == 'manual'
-        assert result['sku'] == '045496508234'
-        
-    def test_classify_with_manual_condition_very_good(self):
-        """Test classification with manual Very Good condition."""
-        classifier = ItemClassifier()
-        result = classifier.classify_item('012569863147', manual_condition='Very Good')
-        
-        assert result['condition'] == 'Very Good'
-        assert result['sku'] == '012569863147-VG'
-        
-    def test_classify_with_manual_condition_acceptable(self):
-        """Test classification with manual Acceptable condition."""
-        classifier = ItemClassifier()
-        result = classifier.classify_item('724384960145', manual_condition='Acceptable')
-        
-        assert result['condition'] == 'Acceptable'
-        assert result['sku'] == '724384960145-A'
+        assert result['sku'] == expected_sku
         
-    def test_classify_without_condition_defaults_acceptable(self):
+    def test_classify_without_condition_defaults_acceptable(self, classifier):
         """Test that missing condition defaults to Acceptable."""
-        classifier = ItemClassifier()
         result = classifier.classify_item('045496508234')
         
         assert result['condition'] == 'Acceptable'
         assert result['condition_source'] == 'default'
         
-    def test_classify_condition_case_insensitive(self):
+    def test_classify_condition_case_insensitive(self, classifier):
         """Test that condition parsing is case-insensitive."""
-        classifier = ItemClassifier()
         
         result1 = classifier.classify_item('045496508234', manual_condition='vg')
         result2 = classifier.classify_item('012569863147', manual_condition='VERY GOOD')
@@ -137,16 +129,14 @@ class TestItemClassifier:
         assert result2['condition'] == 'Very Good'
         assert result3['condition'] == 'Acceptable'
         
-    def test_classify_unknown_condition_defaults(self):
+    def test_classify_unknown_condition_defaults(self, classifier):
         """Test that unknown conditions default to Acceptable."""
-        classifier = ItemClassifier()
         result = classifier.classify_item('045496508234', manual_condition='Unknown')
         
         assert result['condition'] == 'Acceptable'
         
-    def test_classify_unknown_media_type(self):
+    def test_classify_unknown_media_type(self, classifier):
         """Test that media type is unknown when not provided."""
-        classifier = ItemClassifier()
         result = classifier.classify_item('045496508234')
         
         assert result['media_type'] == 'unknown'
@@ -156,20 +146,14 @@ class TestItemClassifier:
 class TestSKUGenerator:
     """Test suite for SKU generation."""
     
-    def test_generate_sku_new(self):
-        """Test SKU generation for New condition."""
-        sku = SKUGenerator.generate('045496508234', ItemCondition.NEW, MediaType.VIDEO_GAME)
-        assert sku == '045496508234'
-        
-    def test_generate_sku_very_good(self):
-        """Test SKU generation for Very Good condition."""
-        sku = SKUGenerator.generate('012569863147', ItemCondition.VERY_GOOD, MediaType.DVD)
-        assert sku == '012569863147-VG'
-        
-    def test_generate_sku_acceptable(self):
-        """Test SKU generation for Acceptable condition."""
-        sku = SKUGenerator.generate('724384960145', ItemCondition.ACCEPTABLE, MediaType.MUSIC_CD)
-        assert sku == '724384960145-A'
+    @pytest.mark.parametrize("upc,condition,media_type,expected_sku", [
+        ('045496508234', ItemCondition.NEW, MediaType.VIDEO_GAME, '045496508234'),
+        ('012569863147', ItemCondition.VERY_GOOD, MediaType.DVD, '012569863147-VG'),
+        ('724384960145', ItemCondition.ACCEPTABLE, MediaType.MUSIC_CD, '724384960145-A'),
+    ])
+    def test_generate_sku(self, upc, condition, media_type, expected_sku):
+        """Test SKU generation for each condition."""
+        assert SKUGenerator.generate(upc, condition, media_type) == expected_sku
         
     def test_generate_sku_different_upcs(self):
         """Test SKU generation with various UPC codes."""
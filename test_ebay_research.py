@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for ebay_research.py
+
+Tests total-price extraction from sold-listing result pages.
+"""
+
+import pytest
+from ebay_research import eBayResearcher
+
+pytest.importorskip('lxml')
+
+
+def listing(price: str = None, shipping: str = None, extra: str = '') -> str:
+    """Return one search-result listing as eBay renders it."""
+    spans = extra
+    if price is not None:
+        spans += f'<span class="s-item__price s-price">{price}</span>'
+    if shipping is not None:
+        spans += f'<span class="s-item__shipping s-shipping">{shipping}</span>'
+    return f'<div class="s-item s-item__pl-on-bottom"><div class="s-item__info">{spans}</div></div>'
+
+
+def page(*listings: str) -> str:
+    """Wrap listings in a results page with unrelated markup around them."""
+    return (
+        '<html><head><title>Sold</title></head><body>'
+        '<div class="header"><span class="s-price">$999.00</span></div>'
+        f'<ul class="srp-results">{"".join(listings)}</ul>'
+        '<div class="footer"><span class="s-shipping">$1.00 shipping</span></div>'
+        '</body></html>'
+    )
+
+
+class StubDriver:
+    """Stand-in for a Selenium driver that only serves page_source."""
+
+    def __init__(self, page_source: str):
+        self.page_source = page_source
+
+
+def extract(html: str, max_results: int = 50):
+    """Run _extract_total_prices against a stubbed page."""
+    researcher = eBayResearcher()
+    researcher.driver = StubDriver(html)
+    return researcher._extract_total_prices(max_results)
+
+
+class TestExtractTotalPrices:
+    """Test suite for eBayResearcher._extract_total_prices."""
+
+    def test_price_plus_shipping(self):
+        """Test each listing's sale price is paired with its own shipping."""
+        html = page(
+            listing('$10.00', '+$4.50 shipping'),
+            listing('$1,200.00', '+$5.00 shipping'),  # out of range
+            listing('$20.00', '+$3.25 shipping'),
+        )
+
+        assert extract(html) == [14.50, 23.25]
+
+    def test_free_and_missing_shipping(self):
+        """Test free, missing and unparseable shipping all count as 0."""
+        html = page(
+            listing('$12.00', 'Free shipping'),
+            listing('$13.00'),
+            listing('$14.00', 'Shipping not specified'),
+        )
+
+        assert extract(html) == [12.00, 13.00, 14.00]
+
+    def test_price_range_uses_low_end(self):
+        """Test 'X to Y' prices use the lower bound."""
+        assert extract(page(listing('$8.00 to $15.00', '+$2.00 shipping'))) == [10.00]
+
+    def test_listing_without_price_skipped(self):
+        """Test listings with no or unparseable price are dropped, not zeroed."""
+        html = page(
+            listing(shipping='+$4.00 shipping'),
+            listing('See price', '+$4.00 shipping'),
+            listing('$9.00', '+$1.00 shipping'),
+        )
+
+        assert extract(html) == [10.00]
+
+    def test_out_of_range_totals_filtered(self):
+        """Test totals must be above $0.99 and below $500."""
+        html = page(
+            listing('$0.50', '+$0.49 shipping'),  # 0.99
+            listing('$0.50', '+$0.50 shipping'),  # 1.00
+            listing('$499.00', '+$0.99 shipping'),  # 499.99
+            listing('$450.00', '+$50.00 shipping'),  # 500.00
+        )
+
+        assert extract(html) == [1.00, 499.99]
+
+    def test_nested_markup_in_price(self):
+        """Test price text split across child elements is joined."""
+        html = page(listing(
+            '<span class="ITALIC">$</span>24<span>.99</span>',
+            '<span class="BOLD">Free</span> shipping',
+            extra='<span class="s-item__title"><span>Game $5.00 off</span></span>',
+        ))
+
+        assert extract(html) == [24.99]
+
+    def test_first_price_span_wins(self):
+        """Test only the first price and shipping span of a listing are used."""
+        second = '<span class="s-price">$99.00</span><span class="s-shipping">$9.00</span>'
+        html = page(listing('$10.00', '+$2.00 shipping').replace('</div></div>', second + '</div></div>'))
+
+        assert extract(html) == [12.00]
+
+    def test_max_results_truncates_listings(self):
+        """Test parsing stops after max_results listings, priced or not."""
+        html = page(
+            listing('$10.00'),
+            listing(),
+            listing('$11.00'),
+            listing('$12.00'),
+        )
+
+        assert extract(html, max_results=3) == [10.00, 11.00]
+        assert extract(html, max_results=50) == [10.00, 11.00, 12.00]
+
+    def test_markup_outside_listings_ignored(self):
+        """Test price spans outside s-item listings are not collected."""
+        assert extract(page()) == []
+
+    def test_parse_error_returns_empty(self):
+        """Test a driver failure is logged and yields no prices."""
+        researcher = eBayResearcher()
+        researcher.driver = None
+
+        assert researcher._extract_total_prices(10) == []
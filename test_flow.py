@@ -5,7 +5,6 @@ Usage: python test_flow.py [image_path]
        OR run with no args for stub test
 """
 import sys
-import json
 from pathlib import Path
 
 # Test the complete pipeline
@@ -13,6 +12,7 @@ from media_analyzer import analyze_disc_image
 from database_lookup import resolve_metadata
 from airtable_handler import create_listing
 from config import get_config_status
+from json_utils import dumps_pretty
 from debug_logging import setup_debug_logger
 
 logger = setup_debug_logger()
@@ -34,7 +34,7 @@ def test_with_image(image_path: str):
     # Step 1: Analyze
     print("\n1️⃣ Analyzing image...")
     analyzer_result = analyze_disc_image(image_bytes)
-    print(f"Result: {json.dumps(analyzer_result, indent=2)}")
+    print(f"Result: {dumps_pretty(analyzer_result)}")
     
     if 'error' in analyzer_result:
         print(f"✗ Analysis failed: {analyzer_result['error']}")
@@ -52,7 +52,7 @@ def test_with_image(image_path: str):
     # Step 3: Create Airtable listing
     print("\n3️⃣ Creating Airtable listing...")
     airtable_result = create_listing(media_record)
-    print(f"Result: {json.dumps(airtable_result, indent=2, default=str)}")
+    print(f"Result: {dumps_pretty(airtable_result, default=str)}")
     
     if 'error' in airtable_result:
         print(f"✗ Airtable creation failed: {airtable_result['error']}")
@@ -78,7 +78,7 @@ def test_stub_flow():
     # Test with empty bytes (will trigger stub)
     print("\n1️⃣ Analyzing (stub)...")
     analyzer_result = analyze_disc_image(b'')
-    print(f"Result: {json.dumps(analyzer_result, indent=2)}")
+    print(f"Result: {dumps_pretty(analyzer_result)}")
     
     print("\n2️⃣ Resolving metadata...")
     media_record = resolve_metadata(analyzer_result)
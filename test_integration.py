@@ -8,7 +8,11 @@ Tests end-to-end flows combining barcode intake, pricing, and eBay listing.
 
 import pytest
 import json
-from price_calculator import PriceCalculator, MIN_PROFIT_MARGIN
+import numpy as np
+from price_calculator import (
+    PriceCalculator, MIN_PROFIT_MARGIN, MARKUP_SCENARIOS, SHIPPING_COST,
+    calculate_offers_batch, pricing_tensor
+)
 from barcode_intake import IntakeWorkflow, ItemCondition
 from datetime import datetime
 
@@ -79,6 +83,12 @@ class TestPricingWorkflowIntegration:
         assert offers['profit_auto_accept'] >= MIN_PROFIT_MARGIN
 
 
+@pytest.fixture(scope="session")
+def large_barcode_set():
+    """100 unique zero-padded 12-digit barcodes, built once per session."""
+    return [f'{i:012d}' for i in range(1000, 1100)]
+
+
 class TestBatchProcessingWorkflow:
     """Integration tests for batch processing scenarios."""
     
@@ -91,6 +101,7 @@ class TestBatchProcessingWorkflow:
         ]
         
         workflow = IntakeWorkflow()
+        calc = PriceCalculator('dvd')
         results = []
         
         for item in inventory_batch:
@@ -99,7 +110,7 @@ class TestBatchProcessingWorkflow:
                 manual_condition=item['condition']
             )
             
-            calc = PriceCalculator(item['media_type'], item['condition'])
+            calc.configure(item['media_type'], item['condition'])
             pricing = calc.calculate_best_offer_prices(
                 calc.calculate_list_price(item['median'], 0.10)
             )
@@ -134,21 +145,118 @@ class TestBatchProcessingWorkflow:
         assert workflow.barcode_intake.duplicates_detected == 1
         assert len(workflow.workflow_log) == 4
         
-    def test_large_batch_processing_100_items(self):
+    def test_large_batch_processing_100_items(self, large_barcode_set):
         """Test processing large batch (100 items)."""
         workflow = IntakeWorkflow()
         
-        # Generate 100 unique barcodes
-        barcodes = [str(i).zfill(12) for i in range(1000, 1100)]
-        
         results = []
-        for barcode in barcodes:
+        for barcode in large_barcode_set:
             result = workflow.process_item(barcode, manual_condition='Very Good')
             results.append(result)
         
         assert len(results) == 100
         assert all(r['status'] == 'success' for r in results)
         assert len(workflow.workflow_log) == 100
+    
+    def test_batch_process_across_workers(self):
+        """Test parallel batch intake matches sequential processing."""
+        batch = [
+            {'barcode': '045496508234', 'condition': 'Very Good', 'median_price': 35.00, 'media_type': 'video_game'},
+            {'barcode': 'ABC123'},
+            {'barcode': '012569863147', 'condition': 'Acceptable', 'median_price': 12.50, 'media_type': 'dvd'},
+            {'barcode': '045496508234', 'condition': 'Very Good'},  # Duplicate
+        ]
+        
+        workflow = IntakeWorkflow()
+        results = workflow.batch_process(batch, max_workers=2)
+        
+        assert [r['status'] for r in results] == ['success', 'failed', 'success', 'success']
+        assert results[0]['classification']['sku'] == '045496508234-VG'
+        assert results[2]['classification']['sku'] == '012569863147-A'
+        assert results[0]['pricing']['meets_margin_threshold']
+        assert 'pricing' not in results[3]
+        assert workflow.barcode_intake.duplicates_detected == 1
+        assert len(workflow.workflow_log) == 3
+    
+    def test_batch_process_pool_preserves_order(self):
+        """Test a worker pool prices chunked items in input order."""
+        calc = PriceCalculator('dvd', 'Very Good')
+        barcodes = [f'{n:012d}' for n in range(40)]
+        batch = [{'barcode': b, 'condition': 'Very Good', 'median_price': 10.00 + n}
+                 for n, b in enumerate(barcodes)]
+        
+        pooled = IntakeWorkflow(price_calculator=calc).batch_process(batch, max_workers=2)
+        in_process = IntakeWorkflow(price_calculator=calc).batch_process(batch)
+        
+        assert [r['barcode'] for r in pooled] == barcodes
+        assert [r['pricing'] for r in pooled] == [r['pricing'] for r in in_process]
+        assert [r['classification']['sku'] for r in pooled] == [f'{b}-VG' for b in barcodes]
+    
+    def test_batch_process_uses_pool_when_asked(self, monkeypatch):
+        """Test max_workers starts a pool even on a single-CPU host."""
+        import barcode_intake
+        started = []
+        real_pool = barcode_intake.ProcessPoolExecutor
+        
+        def recording_pool(max_workers):
+            started.append(max_workers)
+            return real_pool(max_workers=max_workers)
+        
+        monkeypatch.setattr('os.cpu_count', lambda: 1)
+        monkeypatch.setattr(barcode_intake, 'ProcessPoolExecutor', recording_pool)
+        
+        IntakeWorkflow().batch_process([{'barcode': '045496508234'}, {'barcode': '012569863147'}], max_workers=2)
+        IntakeWorkflow().batch_process([{'barcode': '045496508234'}, {'barcode': '012569863147'}])
+        
+        assert started == [2]
+    
+    def test_batch_process_in_process_matches_process_item(self):
+        """Test default batch intake runs in-process and mirrors process_item."""
+        calc = PriceCalculator('dvd', 'Very Good')
+        batch_workflow = IntakeWorkflow(price_calculator=calc)
+        item_workflow = IntakeWorkflow(price_calculator=calc)
+        
+        batch = batch_workflow.batch_process([
+            {'barcode': '012569863147', 'condition': 'Very Good', 'median_price': 12.50},
+        ])[0]
+        single = item_workflow.process_item('012569863147', manual_condition='Very Good', median_price=12.50)
+        
+        assert set(batch) == set(single)
+        assert batch['steps'] == single['steps']
+        assert batch['pricing'] == single['pricing']
+    
+    def test_batch_process_duplicates_match_process_item(self):
+        """Test batch duplicate counts and logged barcodes match process_item."""
+        barcodes = [' 045496508234 ', '045496508234', 'ABC123', '012569863147']
+        batch_workflow = IntakeWorkflow()
+        item_workflow = IntakeWorkflow()
+        
+        batch = batch_workflow.batch_process([{'barcode': b} for b in barcodes])
+        singles = [item_workflow.process_item(b) for b in barcodes]
+        
+        assert [r['barcode'] for r in batch] == [r['barcode'] for r in singles]
+        assert [r['status'] for r in batch] == [r['status'] for r in singles]
+        assert batch_workflow.barcode_intake.duplicates_detected == item_workflow.barcode_intake.duplicates_detected == 1
+        assert len(batch_workflow.workflow_log) == len(item_workflow.workflow_log) == 3
+    
+    def test_batch_offers_match_per_item_pricing(self):
+        """Test batch pricing of 100 items agrees with the per-item calculator."""
+        media_types = ['video_game', 'dvd', 'music_cd', 'dvd'] * 25
+        medians = np.round(np.linspace(0.00, 60.00, 100), 2)
+        shipping = np.array([SHIPPING_COST[m] for m in media_types])
+        
+        offers = calculate_offers_batch(medians, shipping, cog=1.00)
+        
+        assert offers.shape == (100, 4)
+        for media_type, median, row in zip(media_types, medians.tolist(), offers.tolist()):
+            calc = PriceCalculator(media_type, cog=1.00)
+            expected = calc.calculate_best_offer_prices(calc.calculate_list_price(median, 0.10))
+            assert row == [
+                expected['auto_accept'],
+                expected['minimum'],
+                expected['profit_auto_accept'],
+                expected['profit_minimum'],
+            ]
 
 
 class TestPricingMarginValidation:
@@ -217,6 +325,22 @@ class TestPricingMarginValidation:
         
         assert report['total_items'] == 4
         assert report['profitable'] > 0
+        
+    def test_pricing_tensor_matches_per_item_pricing(self):
+        """Test vectorized pricing agrees with the per-item calculator."""
+        medians = [0.00, 1.005, 12.50, 13.00, 35.00]
+        tensor = pricing_tensor(np.array(medians))
+        
+        assert tensor.shape == (len(medians), len(MARKUP_SCENARIOS), 3)
+        
+        calc = PriceCalculator('dvd', cog=1.00)
+        for i, median in enumerate(medians):
+            for j, markup in enumerate(MARKUP_SCENARIOS.tolist()):
+                list_price = calc.calculate_list_price(median, markup)
+                offers = calc.calculate_best_offer_prices(list_price)
+                assert tensor[i, j, 0] == list_price
+                assert tensor[i, j, 1] == offers['auto_accept']
+                assert tensor[i, j, 2] == offers['minimum']
 
 
 class TestSkuGenerationWorkflow:
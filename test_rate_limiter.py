@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for rate_limiter.py
+
+Tests idle-key cleanup and the asynchronous rate-limit check and decorator.
+"""
+
+import asyncio
+import rate_limiter
+from rate_limiter import RateLimiter
+
+
+class FakeClock:
+    """Stand-in for the time module with a settable monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+class TestCleanup:
+    """Test suite for reclaiming buckets of idle limit keys."""
+
+    def test_idle_keys_reclaimed_in_batches(self, monkeypatch):
+        """Test idle keys are swept a bounded batch per request until gone."""
+        clock = FakeClock()
+        monkeypatch.setattr(rate_limiter, 'time', clock)
+        limiter = RateLimiter(cleanup_interval=600)
+        limiter.set_limit('price-lookup', 5)
+        idle_keys = 3 * RateLimiter.CLEANUP_BATCH + 10
+        for n in range(idle_keys):
+            limiter.is_allowed('price-lookup', f'ip-{n}')
+        shard = limiter.requests[limiter._shard('price-lookup')]
+        assert len(shard) == idle_keys
+
+        # Past the window and the cleanup interval, one active key keeps calling
+        clock.now += 700
+        limiter.is_allowed('price-lookup', 'active')
+        assert len(shard) == idle_keys + 1 - RateLimiter.CLEANUP_BATCH
+
+        for _ in range(3):
+            limiter.is_allowed('price-lookup', 'active')
+        assert set(shard) == {('price-lookup', 'active')}
+        assert limiter.get_stats('price-lookup')['current_requests'] == {'active': 4}
+
+    def test_no_sweep_before_interval(self, monkeypatch):
+        """Test expired keys stay until cleanup_interval has passed."""
+        clock = FakeClock()
+        monkeypatch.setattr(rate_limiter, 'time', clock)
+        limiter = RateLimiter(cleanup_interval=600)
+        limiter.set_limit('price-lookup', 5)
+        limiter.is_allowed('price-lookup', 'idle')
+
+        clock.now += 120
+        limiter.is_allowed('price-lookup', 'active')
+
+        assert ('price-lookup', 'idle') in limiter.requests[limiter._shard('price-lookup')]
+
+    def test_recent_keys_survive_sweep(self, monkeypatch):
+        """Test a sweep keeps keys with requests inside their window."""
+        clock = FakeClock()
+        monkeypatch.setattr(rate_limiter, 'time', clock)
+        limiter = RateLimiter(cleanup_interval=600)
+        limiter.set_limit('price-lookup', 5)
+        limiter.is_allowed('price-lookup', 'idle')
+
+        clock.now += 590
+        limiter.is_allowed('price-lookup', 'recent')
+        clock.now += 30
+        limiter.is_allowed('price-lookup', 'active')
+
+        assert set(limiter.get_stats('price-lookup')['current_requests']) == {'recent', 'active'}
+
+
+class TestAsyncRateLimiting:
+    """Test suite for the ASGI-facing RateLimiter API."""
+
+    def test_is_allowed_async_enforces_limit(self):
+        """Test the async check allows up to the limit, then rejects."""
+        limiter = RateLimiter()
+        limiter.set_limit('price-lookup', 2)
+
+        async def check_three():
+            return [await limiter.is_allowed_async('price-lookup', 'user-1') for _ in range(3)]
+
+        results = asyncio.run(check_three())
+
+        assert results[:2] == [(True, None), (True, None)]
+        assert results[2][0] is False
+        assert 0 < results[2][1] <= 60
+        # Shares buckets with the sync path
+        assert limiter.get_stats('price-lookup')['current_requests'] == {'user-1': 2}
+
+    def test_is_allowed_async_unconfigured_endpoint(self):
+        """Test endpoints without a limit are always allowed."""
+        limiter = RateLimiter()
+
+        assert asyncio.run(limiter.is_allowed_async('unknown')) == (True, None)
+
+    def test_async_limit_decorator(self):
+        """Test the async decorator passes through, then returns a 429 tuple."""
+        limiter = RateLimiter()
+
+        @limiter.async_limit('telegram-webhook', requests_per_minute=1,
+                             key_func=lambda user: user)
+        async def handler(user):
+            return 'OK'
+
+        async def call_handlers():
+            return await asyncio.gather(handler('a'), handler('a'), handler('b'))
+
+        first, second, other_user = asyncio.run(call_handlers())
+
+        assert first == 'OK'
+        assert other_user == 'OK'
+        body, status, headers = second
+        assert status == 429
+        assert body.startswith(b'{"error":"Rate limit exceeded"')
+        assert headers['Content-Type'] == 'application/json'
+        assert int(headers['Retry-After']) > 0
+        assert handler.__name__ == 'handler'
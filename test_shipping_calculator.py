@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for shipping_calculator.py
+
+Tests shipping cost calculation, media-type estimates, and bulk estimates.
+"""
+
+import pytest
+from shipping_calculator import ShippingCalculator, ShippingMethod
+
+
+class TestShippingMethods:
+    """Test suite for method lookup in ShippingCalculator."""
+
+    def test_calculate_cost_accepts_enum_member(self):
+        """Test ShippingMethod members price the same as their strings."""
+        calc = ShippingCalculator()
+
+        total, details = calc.calculate_cost(ShippingMethod.MEDIA_MAIL, 5)
+
+        assert total == 4.47
+        assert details['base_rate'] == 4.47
+        assert total == calc.calculate_cost('media_mail', 5)[0]
+
+    def test_bulk_estimate_accepts_enum_member(self):
+        """Test bulk estimates resolve ShippingMethod members."""
+        calc = ShippingCalculator()
+
+        result = calc.bulk_estimate([
+            {'method': ShippingMethod.GROUND_ADVANTAGE, 'weight_oz': 20},
+            {'method': 'media_mail', 'weight_oz': 4},
+        ])
+
+        assert result['items'][0]['base_rate'] == 5.25
+        assert result['total_cost'] == round(5.25 + 0.50 + 4.47, 2)
+
+    def test_unknown_method_raises(self):
+        """Test unknown methods raise ValueError."""
+        calc = ShippingCalculator()
+
+        with pytest.raises(ValueError):
+            calc.calculate_cost('carrier_pigeon', 5)
+
+
+class TestBulkEstimate:
+    """Test suite for vectorized bulk estimates."""
+
+    @pytest.mark.parametrize('rate', [1.055, 4.005, 2.675, 4.47])
+    def test_bulk_matches_calculate_cost(self, rate):
+        """Test bulk totals round exactly as per-item calculate_cost does."""
+        calc = ShippingCalculator({'media_mail': rate, 'ground_advantage': rate + 0.5})
+        items = [{'method': method, 'weight_oz': weight}
+                 for method in ('media_mail', 'ground_advantage')
+                 for weight in (0, 4, 16, 20, 32, 50, 64, 100, 128, 200)]
+
+        result = calc.bulk_estimate(items)
+        expected = [calc.calculate_cost(item['method'], item['weight_oz']) for item in items]
+
+        assert [detail['total'] for detail in result['items']] == [cost for cost, _ in expected]
+        assert result['items'] == [details for _, details in expected]
+        assert result['total_cost'] == round(sum(cost for cost, _ in expected), 2)
+
+    def test_sub_cent_rate(self):
+        """Test a sub-cent custom rate rounds to the same cent both ways."""
+        calc = ShippingCalculator({'media_mail': 1.055})
+
+        assert calc.calculate_cost('media_mail', 4)[0] == 1.05
+        assert calc.bulk_estimate([{'method': 'media_mail', 'weight_oz': 4}])['items'][0]['total'] == 1.05
+
+
+class TestEstimateCache:
+    """Test suite for memoized media-type estimates."""
+
+    def test_estimate_reflects_rate_changes(self):
+        """Test editing rates after an estimate invalidates the cached result."""
+        calc = ShippingCalculator()
+        assert calc.estimate_for_media_type('dvd')['media_mail']['base_rate'] == 4.47
+
+        calc.rates['media_mail'] = 9.00
+        estimate = calc.estimate_for_media_type('dvd')
+
+        assert estimate['media_mail']['base_rate'] == 9.00
+        assert estimate['recommended'] == 'ground_advantage'
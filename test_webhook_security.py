@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for webhook_security.py
+
+Tests signature checks, body limits, JSON validation and sanitization.
+"""
+
+import io
+import json
+import hmac
+import hashlib
+import pytest
+from flask import Flask, jsonify
+from webhook_security import WebhookValidator, webhook_required
+
+TOKEN = 'test-bot-token'
+SIG_HEADER = 'X-Telegram-Bot-Api-Secret-Hash'
+
+# WSGI servers that decode chunked bodies (gunicorn, ...) flag the input as
+# terminated so Werkzeug reads it without a Content-Length
+CHUNKED_ENVIRON = {'wsgi.input_terminated': True}
+
+
+def sign(body: bytes, token: str = TOKEN) -> str:
+    """Return the hex HMAC-SHA256 signature Telegram would send."""
+    return hmac.new(token.encode(), body, hashlib.sha256).hexdigest()
+
+
+def make_app(validator: WebhookValidator) -> Flask:
+    """Build an app with a decorated webhook route."""
+    app = Flask(__name__)
+
+    @app.route('/webhook', methods=['POST'])
+    @webhook_required(validator)
+    def webhook(data):
+        return jsonify({'received': data})
+
+    return app
+
+
+def post(client, path: str, body: bytes, headers=None, **kwargs):
+    """POST a JSON body over HTTPS."""
+    return client.post(path, data=body, content_type='application/json',
+                       headers=headers or {}, base_url='https://localhost', **kwargs)
+
+
+class TestWithoutToken:
+    """Test suite for validators built without a bot token."""
+
+    def test_none_token_is_accepted(self):
+        """Test a validator can be built when TELEGRAM_BOT_TOKEN is unset."""
+        validator = WebhookValidator(None)
+
+        assert validator.validate_telegram_signature(b'{}', sign(b'{}')) is False
+
+    def test_unsigned_request_still_validates(self):
+        """Test requests without a signature header pass with no token."""
+        client = make_app(WebhookValidator(None)).test_client()
+
+        response = post(client, '/webhook', b'{"ok": true}')
+
+        assert response.status_code == 200
+        assert response.get_json() == {'received': {'ok': True}}
+
+    def test_signed_request_rejected(self):
+        """Test signed requests fail when there is no token to check them."""
+        client = make_app(WebhookValidator(None)).test_client()
+
+        response = post(client, '/webhook', b'{}', {SIG_HEADER: sign(b'{}')})
+
+        assert response.status_code == 400
+        assert response.get_json() == {'error': 'Invalid signature'}
+
+
+class SmallLimitValidator(WebhookValidator):
+    """Validator with a tiny payload limit so tests stay fast."""
+
+    __slots__ = ()
+    MAX_PAYLOAD_SIZE = 64
+
+
+@pytest.fixture
+def client():
+    """Test client for an app with two webhook routes."""
+    validator = WebhookValidator(TOKEN)
+    app = make_app(validator)
+
+    @app.route('/other', methods=['POST'])
+    @webhook_required(validator)
+    def other(data):
+        return jsonify({'other': data})
+
+    return app.test_client()
+
+
+class TestSignature:
+    """Test suite for Telegram signature checks."""
+
+    def test_valid_signature(self, client):
+        """Test a correctly signed body is accepted."""
+        body = b'{"update_id": 1}'
+
+        response = post(client, '/webhook', body, {SIG_HEADER: sign(body)})
+
+        assert response.status_code == 200
+        assert response.get_json() == {'received': {'update_id': 1}}
+
+    @pytest.mark.parametrize('signature', [
+        sign(b'{"update_id": 2}'),          # signs a different body
+        sign(b'{"update_id": 1}', 'other'),  # wrong token
+        'z' * 64,                            # right length, not hex
+        sign(b'{"update_id": 1}')[:-2],      # too short
+        sign(b'{"update_id": 1}') + '00',    # too long
+    ])
+    def test_invalid_signature(self, client, signature):
+        """Test mismatched, non-hex and wrong-length signatures are rejected."""
+        response = post(client, '/webhook', b'{"update_id": 1}', {SIG_HEADER: signature})
+
+        assert response.status_code == 400
+        assert response.get_json() == {'error': 'Invalid signature'}
+
+    def test_upper_case_hex_signature(self, client):
+        """Test digests are compared as bytes, so hex case doesn't matter."""
+        body = b'{"update_id": 1}'
+
+        response = post(client, '/webhook', body, {SIG_HEADER: sign(body).upper()})
+
+        assert response.status_code == 200
+
+    @pytest.mark.parametrize('signature', ['ab', 'z' * 64])
+    def test_malformed_signature_skips_hashing(self, signature):
+        """Test wrong-length and non-hex headers never touch the HMAC."""
+        class NoHashing:
+            def copy(self):
+                raise AssertionError('body was hashed')
+
+        validator = WebhookValidator(TOKEN)
+        validator._hmac_template = NoHashing()
+
+        assert validator.validate_telegram_signature(b'{}', signature) is False
+
+    def test_signature_covers_raw_bytes(self, client):
+        """Test the signature is checked before control bytes are stripped."""
+        body = b'{"text": "a\\x00b"}'.replace(b'\\x00', b'\x00')
+
+        response = post(client, '/webhook', body, {SIG_HEADER: sign(body)})
+
+        assert response.status_code == 200
+        assert response.get_json() == {'received': {'text': 'ab'}}
+
+
+class TestBody:
+    """Test suite for body limits and JSON parsing."""
+
+    def test_oversized_body_with_content_length(self):
+        """Test a body over the limit is refused from its Content-Length."""
+        client = make_app(SmallLimitValidator(TOKEN)).test_client()
+
+        response = post(client, '/webhook', b'{"a": "' + b'x' * 100 + b'"}')
+
+        assert response.status_code == 400
+        assert response.get_json()['error'].startswith('Payload too large')
+
+    @pytest.mark.parametrize('use_init_app', [False, True])
+    def test_oversized_chunked_body(self, use_init_app):
+        """Test a chunked body with no Content-Length is cut off at the limit."""
+        validator = SmallLimitValidator(TOKEN)
+        app = make_app(validator)
+        if use_init_app:
+            validator.init_app(app)
+        body = b'{"a": "' + b'x' * 100 + b'"}'
+
+        response = app.test_client().post(
+            '/webhook', input_stream=io.BytesIO(body), content_type='application/json',
+            headers={'Transfer-Encoding': 'chunked'}, base_url='https://localhost',
+            environ_overrides=CHUNKED_ENVIRON
+        )
+
+        assert response.status_code == 400
+        assert response.get_json() == {'error': 'Payload too large: > 64'}
+
+    def test_chunked_body_within_limit(self):
+        """Test a chunked body under the limit is read in full."""
+        validator = SmallLimitValidator(TOKEN)
+        app = make_app(validator)
+        validator.init_app(app)
+
+        response = app.test_client().post(
+            '/webhook', input_stream=io.BytesIO(b'{"a": 1}'), content_type='application/json',
+            headers={'Transfer-Encoding': 'chunked'}, base_url='https://localhost',
+            environ_overrides=CHUNKED_ENVIRON
+        )
+
+        assert response.status_code == 200
+        assert response.get_json() == {'received': {'a': 1}}
+
+    def test_init_app_keeps_lower_limit(self):
+        """Test init_app only ever lowers MAX_CONTENT_LENGTH."""
+        validator = SmallLimitValidator(TOKEN)
+        app = Flask(__name__)
+
+        validator.init_app(app)
+        assert app.config['MAX_CONTENT_LENGTH'] == 64
+
+        app.config['MAX_CONTENT_LENGTH'] = 10
+        validator.init_app(app)
+        assert app.config['MAX_CONTENT_LENGTH'] == 10
+
+    @pytest.mark.parametrize('body', [b'[1, 2]', b'"text"', b'42', b'null'])
+    def test_non_object_body(self, client, body):
+        """Test JSON that is not an object is rejected."""
+        response = post(client, '/webhook', body)
+
+        assert response.status_code == 400
+        assert response.get_json() == {'error': 'JSON must be object'}
+
+    @pytest.mark.parametrize('body', [b'{"a": ', b'not json', b''])
+    def test_bad_json(self, client, body):
+        """Test unparseable bodies are rejected."""
+        response = post(client, '/webhook', body)
+
+        assert response.status_code == 400
+        assert response.get_json()['error'].startswith('Invalid JSON')
+
+    def test_wrong_content_type(self, client):
+        """Test non-JSON content types are rejected before the body is read."""
+        response = client.post('/webhook', data=b'{}', content_type='text/plain',
+                               base_url='https://localhost')
+
+        assert response.status_code == 400
+        assert response.get_json() == {'error': 'Invalid content type: text/plain'}
+
+    def test_http_rejected(self, client):
+        """Test plain-HTTP requests are rejected."""
+        response = client.post('/webhook', data=b'{}', content_type='application/json')
+
+        assert response.status_code == 400
+        assert response.get_json() == {'error': 'HTTPS required for webhook'}
+
+
+class TestWebhookRequired:
+    """Test suite for the webhook_required decorator."""
+
+    def test_two_routes_on_one_app(self, client):
+        """Test decorated views keep their names, so routes don't collide."""
+        first = post(client, '/webhook', b'{"n": 1}')
+        second = post(client, '/other', b'{"n": 2}')
+
+        assert first.get_json() == {'received': {'n': 1}}
+        assert second.get_json() == {'other': {'n': 2}}
+        assert {'webhook', 'other'} <= set(client.application.view_functions)
+
+
+def nested(levels: int) -> dict:
+    """Return a chain of `levels` dicts, each holding the next under 'k'."""
+    data = {'leaf': 'value'}
+    for _ in range(levels - 1):
+        data = {'k': data}
+    return data
+
+
+class TestSanitizeDict:
+    """Test suite for WebhookValidator.sanitize_dict."""
+
+    def setup_method(self):
+        """Create a validator for each test."""
+        self.validator = WebhookValidator(TOKEN)
+
+    def test_max_depth_allowed(self):
+        """Test dicts nested exactly MAX_NESTING_DEPTH deep are kept."""
+        data = nested(WebhookValidator.MAX_NESTING_DEPTH)
+
+        assert self.validator.sanitize_dict(data) == data
+
+    def test_too_deep_rejected(self):
+        """Test one level past MAX_NESTING_DEPTH raises ValueError."""
+        with pytest.raises(ValueError):
+            self.validator.sanitize_dict(nested(WebhookValidator.MAX_NESTING_DEPTH + 1))
+
+    def test_too_deep_is_bad_json_response(self, client):
+        """Test over-deep payloads become a 400 rather than a server error."""
+        body = json.dumps(nested(WebhookValidator.MAX_NESTING_DEPTH + 1)).encode()
+
+        response = post(client, '/webhook', body)
+
+        assert response.status_code == 400
+        assert response.get_json()['error'].startswith('Invalid JSON')
+
+    @pytest.mark.parametrize('key, expected', [
+        ('plain', 'plain'),
+        ('ta\tb', 'ta\tb'),
+        ('nu\x00ll', 'null'),
+        ('be\x07ll', 'bell'),
+        ('de\x7fl', 'del'),
+        ('  edge  ', 'edge'),
+        (' \x00 ', ''),
+        ('k' * 300, 'k' * 256),
+        (7, '7'),
+    ])
+    def test_keys_cleaned(self, key, expected):
+        """Test keys lose control characters and edge spaces and are capped."""
+        assert list(self.validator.sanitize_dict({key: 1})) == [expected]
+
+    def test_values_cleaned(self):
+        """Test string values lose control characters including DEL."""
+        data = {
+            'text': ' a\x00b\x7fc\x1fd ',
+            'multiline': 'one\ntwo\r\n',
+            'items': ['x\x7f', 3],
+            'nested': {'inner': '\x7fz'},
+        }
+
+        assert self.validator.sanitize_dict(data) == {
+            'text': 'abcd',
+            'multiline': 'one\ntwo',
+            'items': ['x', '3'],
+            'nested': {'inner': 'z'},
+        }
+
+    def test_scalars_pass_through(self):
+        """Test numbers, booleans and None are kept as-is."""
+        data = {'int': 1, 'float': 2.5, 'bool': True, 'none': None}
+
+        result = self.validator.sanitize_dict(data)
+
+        assert result == data
+        assert result['bool'] is True
+
+    def test_key_collision_last_value_wins(self):
+        """Test keys that sanitize alike keep the first position, last value."""
+        result = self.validator.sanitize_dict({'a': 1, 'b': 2, ' a ': 3, 'a\x00': 4})
+
+        assert result == {'a': 4, 'b': 2}
+        assert list(result) == ['a', 'b']
+
+    def test_key_order_preserved(self):
+        """Test nested dicts keep their place among sibling keys."""
+        data = {'z': 1, 'm': {'y': 1, 'b': {'c': 1}, 'a': 2}, 'b': 3}
+
+        result = self.validator.sanitize_dict(data)
+
+        assert list(result) == ['z', 'm', 'b']
+        assert list(result['m']) == ['y', 'b', 'a']
+
+    def test_non_dict_returns_empty(self):
+        """Test non-dict input sanitizes to an empty dict."""
+        assert self.validator.sanitize_dict(['a']) == {}
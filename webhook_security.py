@@ -8,8 +8,50 @@ Handles token validation, HTTPS enforcement, payload limits, and input sanitizat
 
 import hmac
 import hashlib
+from functools import wraps
 from typing import Dict, Tuple, Optional
 from flask import request, jsonify
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from json_utils import loads
+
+# Null bytes and control characters (C0 other than tab, newline and carriage
+# return, plus DEL), folded into translate tables once at import
+_CTRL_CHARS = ''.join(chr(c) for c in range(32) if c not in (9, 10, 13)) + '\x7f'
+_CTRL_DELETE = str.maketrans('', '', _CTRL_CHARS)
+
+# The same characters as raw bytes, for bytes.translate on undecoded bodies
+_CTRL_BYTES = _CTRL_CHARS.encode('ascii')
+
+# Values sanitize_dict passes through untouched
+_SCALAR_TYPES = (int, float, bool)
+
+
+def _sanitize_bytes(body: bytes) -> bytes:
+    """Drop raw control bytes from a UTF-8 body in one C-level pass.
+
+    ASCII bytes never occur inside multi-byte UTF-8 sequences, and JSON
+    whitespace is only space, tab, LF and CR, so stripping these bytes cannot
+    split a token: raw control bytes inside strings are dropped rather than
+    failing the parse. Escaped control characters (e.g. \\u0000) survive and
+    are still removed by sanitize_string after parsing.
+    """
+    return body.translate(None, _CTRL_BYTES)
+
+
+class ValidationError(Exception):
+    """Raised when a webhook request fails validation."""
+
+    def __init__(self, message: str, status: int = 400):
+        """Initialize error.
+
+        Args:
+            message: Human-readable reason, returned to the client
+            status: HTTP status code for the error response
+        """
+        super().__init__(message)
+        self.payload = {'error': message}
+        self.status = status
 
 
 class WebhookValidator:
@@ -17,15 +59,37 @@ class WebhookValidator:
 
     MAX_PAYLOAD_SIZE = 100 * 1024 * 1024  # 100MB
     MAX_STRING_LENGTH = 10000  # Max length for string fields
+    MAX_NESTING_DEPTH = 64  # Max levels of nested objects
+    SIGNATURE_HEX_LENGTH = 2 * hashlib.sha256().digest_size  # 64 hex chars
     ALLOWED_CONTENT_TYPES = {'application/json'}
 
-    def __init__(self, telegram_token: str):
+    __slots__ = ('telegram_token', '_hmac_template')
+
+    def __init__(self, telegram_token: Optional[str]):
         """Initialize validator.
 
         Args:
-            telegram_token: Bot token for HMAC validation
+            telegram_token: Bot token for HMAC validation; if unset, signed
+                requests are rejected
         """
         self.telegram_token = telegram_token
+        # Keyed HMAC state; copied per request so the key is only set up once
+        self._hmac_template = (
+            hmac.new(telegram_token.encode(), b'', hashlib.sha256) if telegram_token else None
+        )
+
+    def init_app(self, app):
+        """Cap request bodies at MAX_PAYLOAD_SIZE for a Flask app.
+
+        With MAX_CONTENT_LENGTH set, Werkzeug refuses oversized requests
+        before reading them, including chunked bodies with no Content-Length.
+
+        Args:
+            app: Flask application serving the webhook endpoints
+        """
+        limit = app.config.get('MAX_CONTENT_LENGTH')
+        if limit is None or limit > self.MAX_PAYLOAD_SIZE:
+            app.config['MAX_CONTENT_LENGTH'] = self.MAX_PAYLOAD_SIZE
 
     def validate_telegram_signature(self, data: bytes, signature: str) -> bool:
         """Validate Telegram webhook signature using HMAC-SHA256.
@@ -37,12 +101,18 @@ class WebhookValidator:
         Returns:
             True if signature is valid
         """
-        expected = hmac.new(
-            self.telegram_token.encode(),
-            data,
-            hashlib.sha256
-        ).hexdigest()
-        return hmac.compare_digest(expected, signature)
+        # Malformed headers can never match, so skip hashing the body for
+        # them; the length is public, so this leaks nothing about the MAC
+        if self._hmac_template is None or len(signature) != self.SIGNATURE_HEX_LENGTH:
+            return False
+        # Compare raw digests; a header that isn't hex can never match
+        try:
+            received = bytes.fromhex(signature)
+        except ValueError:
+            return False
+        mac = self._hmac_template.copy()
+        mac.update(data)
+        return hmac.compare_digest(mac.digest(), received)
 
     def validate_https(self) -> Tuple[bool, Optional[str]]:
         """Ensure request uses HTTPS (production only).
@@ -65,14 +135,42 @@ class WebhookValidator:
             return False, f"Payload too large: {content_length} > {self.MAX_PAYLOAD_SIZE}"
         return True, None
 
+    def read_body(self) -> Tuple[Optional[bytes], Optional[str]]:
+        """Read the request body, stopping once it exceeds MAX_PAYLOAD_SIZE.
+
+        Reads straight from the input stream, so a body sent without
+        Content-Length is never buffered past the limit. The body is not
+        cached on the request.
+
+        Returns:
+            Tuple of (body, error_message)
+        """
+        too_large = f"Payload too large: > {self.MAX_PAYLOAD_SIZE}"
+        chunks = []
+        size = 0
+        try:
+            stream = request.stream
+            while size <= self.MAX_PAYLOAD_SIZE:
+                chunk = stream.read(min(self.MAX_PAYLOAD_SIZE + 1 - size, 64 * 1024))
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                size += len(chunk)
+        except RequestEntityTooLarge:
+            return None, too_large
+        if size > self.MAX_PAYLOAD_SIZE:
+            return None, too_large
+        return b''.join(chunks), None
+
     def validate_content_type(self) -> Tuple[bool, Optional[str]]:
         """Check content type is JSON.
 
         Returns:
             Tuple of (is_valid, error_message)
         """
+        # The media type leads the header; parameters (charset) follow it
         ct = request.content_type or ''
-        if 'application/json' not in ct:
+        if not ct.startswith('application/json'):
             return False, f"Invalid content type: {ct}"
         return True, None
 
@@ -90,44 +188,78 @@ class WebhookValidator:
             return ""
 
         limit = max_length or self.MAX_STRING_LENGTH
-        if len(value) > limit:
-            value = value[:limit]
-
-        # Remove null bytes and control characters
-        value = ''.join(c for c in value if ord(c) >= 32 or c in '\t\n\r')
-        return value.strip()
+        # Truncate (slicing a short string returns it as-is), then remove null
+        # bytes and control characters
+        return value[:limit].translate(_CTRL_DELETE).strip()
 
     def sanitize_dict(self, data: Dict) -> Dict:
-        """Recursively sanitize dictionary.
+        """Sanitize a dictionary and every dictionary nested inside it.
+
+        Nested dictionaries are walked with an explicit stack rather than
+        recursion, so hostile payloads cannot exhaust the call stack.
 
         Args:
             data: Dictionary to sanitize
 
         Returns:
             Sanitized dictionary
+
+        Raises:
+            ValueError: If dictionaries nest deeper than MAX_NESTING_DEPTH
         """
         if not isinstance(data, dict):
             return {}
 
         sanitized = {}
-        for key, value in data.items():
-            safe_key = self.sanitize_string(str(key), max_length=256)
-            if isinstance(value, str):
-                sanitized[safe_key] = self.sanitize_string(value)
-            elif isinstance(value, dict):
-                sanitized[safe_key] = self.sanitize_dict(value)
-            elif isinstance(value, (list, tuple)):
-                sanitized[safe_key] = [self.sanitize_string(str(v)) for v in value]
-            else:
-                sanitized[safe_key] = value
+        # (source dict, sanitized copy being filled, nesting depth)
+        stack = [(data, sanitized, 1)]
+        while stack:
+            source, target, depth = stack.pop()
+            for key, value in source.items():
+                # Short printable keys without edge spaces are already clean
+                if (type(key) is str and len(key) <= 256 and key.isprintable()
+                        and not key.startswith(' ') and not key.endswith(' ')):
+                    safe_key = key
+                else:
+                    safe_key = self.sanitize_string(str(key), max_length=256)
+
+                # Exact-type checks first: JSON payloads only produce these types
+                value_type = type(value)
+                if value_type is str:
+                    target[safe_key] = self.sanitize_string(value)
+                elif value_type in _SCALAR_TYPES or value is None:
+                    target[safe_key] = value
+                elif isinstance(value, str):
+                    target[safe_key] = self.sanitize_string(value)
+                elif isinstance(value, dict):
+                    if depth >= self.MAX_NESTING_DEPTH:
+                        raise ValueError(f"Nesting deeper than {self.MAX_NESTING_DEPTH} levels")
+                    # Insert the copy now so key order matches the source
+                    child = target[safe_key] = {}
+                    stack.append((value, child, depth + 1))
+                elif isinstance(value, (list, tuple)):
+                    target[safe_key] = [self.sanitize_string(str(v)) for v in value]
+                else:
+                    target[safe_key] = value
         return sanitized
 
-    def validate_request(self) -> Tuple[bool, Optional[Dict]]:
+    def validate_request(self, body: Optional[bytes] = None) -> Tuple[bool, Optional[Dict]]:
         """Run all validations on request.
 
+        Args:
+            body: Raw request body, if already read (default: request data)
+
         Returns:
             Tuple of (is_valid, error_dict)
         """
+        valid, error = self._validate_headers()
+        if not valid:
+            return False, error
+
+        return self._validate_signature(request.get_data() if body is None else body)
+
+    def _validate_headers(self) -> Tuple[bool, Optional[Dict]]:
+        """Run the checks that need only the request line and headers."""
         # Check HTTPS
         valid, error = self.validate_https()
         if not valid:
@@ -143,10 +275,13 @@ class WebhookValidator:
         if not valid:
             return False, {'error': error}
 
-        # Validate Telegram signature if header present
+        return True, None
+
+    def _validate_signature(self, body: bytes) -> Tuple[bool, Optional[Dict]]:
+        """Validate Telegram signature if header present."""
         sig = request.headers.get('X-Telegram-Bot-Api-Secret-Hash')
         if sig:
-            if not self.validate_telegram_signature(request.data, sig):
+            if not self.validate_telegram_signature(body, sig):
                 return False, {'error': 'Invalid signature'}
 
         return True, None
@@ -157,17 +292,41 @@ class WebhookValidator:
         Returns:
             Tuple of (data, error_dict)
         """
-        valid, error = self.validate_request()
+        try:
+            return self.get_validated_json_or_raise(), None
+        except ValidationError as e:
+            return None, e.payload
+
+    def get_validated_json_or_raise(self) -> Dict:
+        """Get and validate JSON body, raising on any failure.
+
+        Returns:
+            Sanitized JSON object
+
+        Raises:
+            ValidationError: If the request or its body fails validation
+        """
+        valid, error = self._validate_headers()
+        if not valid:
+            raise ValidationError(error['error'])
+
+        # One bounded read feeds both the signature check (on the exact bytes
+        # received) and the parser (on the control-byte-stripped copy)
+        body, error = self.read_body()
+        if error:
+            raise ValidationError(error)
+
+        valid, error = self._validate_signature(body)
         if not valid:
-            return None, error
+            raise ValidationError(error['error'])
 
         try:
-            data = request.get_json(force=True)
-            if not isinstance(data, dict):
-                return None, {'error': 'JSON must be object'}
-            return self.sanitize_dict(data), None
+            data = loads(_sanitize_bytes(body))
+            if isinstance(data, dict):
+                return self.sanitize_dict(data)
         except Exception as e:
-            return None, {'error': f'Invalid JSON: {str(e)}'}
+            raise ValidationError(f'Invalid JSON: {str(e)}')
+        raise ValidationError('JSON must be object')
 
 
 def webhook_required(validator: WebhookValidator):
@@ -183,11 +342,13 @@ def webhook_required(validator: WebhookValidator):
             return jsonify({'status': 'ok'})
     """
     def decorator(f):
+        @wraps(f)
         def decorated_function(*args, **kwargs):
-            data, error = validator.get_validated_json()
-            if error:
-                response = jsonify(error)
-                response.status_code = 400
+            try:
+                data = validator.get_validated_json_or_raise()
+            except ValidationError as e:
+                response = jsonify(e.payload)
+                response.status_code = e.status
                 return response
             return f(data, *args, **kwargs)
         return decorated_function